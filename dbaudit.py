@@ -8,23 +8,47 @@ and restore capabilities. Uses pg_service.conf for authentication.
 
 import os
 import sys
+
+from utils import __version__
+
+# Answer a bare --version before click, rich and the log handlers are loaded
+if __name__ == "__main__" and sys.argv[1:] in (["-v"], ["--version"]):
+    print(f"dbaudit, version {__version__}")
+    sys.exit(0)
+
 import json
+import atexit
+import queue
 import logging
+import logging.handlers
 import pathlib
-import datetime
+from datetime import datetime
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
 import click
 from rich.console import Console
 from rich.logging import RichHandler
+from rich.table import Table
+from rich.text import Text
 
-from pg_service import PgServiceConfigParser, ServiceConfig
-from utils.connection import PostgresConnection
-from utils.audit import PermissionAuditor, PermissionRisk
-from utils.backup import BackupManager
-from utils.fixes import PermissionFixer
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard json module
+    orjson = None
+
+from pg_service import PgServiceConfigParser, ServiceConfig, find_pg_service_conf
+
+# Set once the working directories have been created in this process
+_directories_ready = False
 
 # Create necessary directories
 def ensure_directories_exist():
     """Ensure that necessary directories exist and create required configuration files."""
+    global _directories_ready
+    if _directories_ready:
+        return
+    
     # Create directories
     directories = [
         'backups', 
@@ -37,7 +61,6 @@ def ensure_directories_exist():
     
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
-        print(f"Ensured directory exists: {directory}")
     
     # Create default configuration files if they don't exist
     default_config_files = {
@@ -45,23 +68,31 @@ def ensure_directories_exist():
     }
     
     for file_path, content in default_config_files.items():
-        if not os.path.exists(file_path):
-            with open(file_path, 'w') as f:
-                f.write(content)
-            print(f"Created default configuration file: {file_path}")
-
-# Ensure directories exist at startup
-ensure_directories_exist()
+        config_file = pathlib.Path(file_path)
+        if not config_file.exists():
+            config_file.write_text(content)
+            logger.info(f"Created default configuration file: {file_path}")
+    
+    _directories_ready = True
 
 # Set PGSERVICEFILE environment variable to use the project directory's pg_service.conf
 project_pg_service_path = os.path.abspath('pg_service.conf')
 os.environ['PGSERVICEFILE'] = project_pg_service_path
 logger = logging.getLogger("dbaudit")
-logger.debug(f"Setting PGSERVICEFILE to: {project_pg_service_path}")
+logger.debug("Setting PGSERVICEFILE to: %s", project_pg_service_path)
 
 # Configure rich console for better output
 console = Console()
 
+# Summary labels are parsed from markup once and reused on every report
+_SUMMARY_HEADER = Text.from_markup("\n[bold blue]AUDIT SUMMARY[/bold blue]")
+_DETAILED_HEADER = Text.from_markup("\n[bold blue]DETAILED AUDIT REPORT[/bold blue]")
+_SUPERUSERS_LABEL = Text.from_markup("\n[bold]Superuser Roles:[/bold]")
+_ISSUES_LABEL = Text.from_markup("\n[bold]Permission Issues:[/bold]")
+_HIGH_LABEL = Text.from_markup("  [bold red]High Risk:[/bold red]")
+_MEDIUM_LABEL = Text.from_markup("  [bold yellow]Medium Risk:[/bold yellow]")
+_LOW_LABEL = Text.from_markup("  [bold green]Low Risk:[/bold green]")
+
 # Configure logging with rich
 logging.basicConfig(
     level=logging.INFO,
@@ -71,82 +102,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger("dbaudit")
 
-# Also set up file logging
+# Also set up file logging (the file is opened on first write, once the
+# data/logs directory has been created by the running command)
 log_file_path = os.path.join("data", "logs", "dbaudit_results.log")
-file_handler = logging.FileHandler(log_file_path)
+file_handler = logging.FileHandler(log_file_path, delay=True)
 file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-logger.addHandler(file_handler)
 
-# Function to find pg_service.conf in various locations
-def find_pg_service_conf():
-    """
-    Look for pg_service.conf in multiple locations in order:
-    1. Current directory (highest priority)
-    2. Config subdirectory
-    3. PGSERVICEFILE environment variable if set
-    4. APPDATA/postgresql directory on Windows
-    5. ~/.pg_service.conf
-    6. /etc/postgresql-common/pg_service.conf on Unix
-    """
-    # Check current directory (highest priority)
-    current_dir = pathlib.Path(".")
-    current_path = current_dir / "pg_service.conf"
-    if current_path.exists():
-        logger.debug(f"Using pg_service.conf from current directory: {current_path.resolve()}")
-        return current_path
-    
-    # Check config subdirectory
-    config_dir = current_dir / "config"
-    config_path = config_dir / "pg_service.conf"
-    if config_path.exists():
-        logger.debug(f"Using pg_service.conf from config directory: {config_path.resolve()}")
-        return config_path
-    
-    # Check environment variable
-    pg_service_env = os.environ.get('PGSERVICEFILE')
-    if pg_service_env:
-        env_path = pathlib.Path(pg_service_env)
-        if env_path.exists():
-            logger.debug(f"Using pg_service.conf from PGSERVICEFILE env: {env_path}")
-            return env_path
-    
-    # Platform specific checks
-    if os.name == 'nt':  # Windows
-        # Check APPDATA/postgresql directory
-        appdata = os.environ.get('APPDATA')
-        if appdata:
-            appdata_path = pathlib.Path(appdata) / "postgresql" / "pg_service.conf"
-            if appdata_path.exists():
-                logger.debug(f"Using pg_service.conf from APPDATA: {appdata_path}")
-                return appdata_path
-    else:  # Unix-like systems
-        # Check /etc/postgresql-common/
-        etc_path = pathlib.Path("/etc/postgresql-common/pg_service.conf")
-        if etc_path.exists():
-            logger.debug(f"Using pg_service.conf from system directory: {etc_path}")
-            return etc_path
-    
-    # Fall back to home directory
-    home_dir = pathlib.Path.home()
-    home_path = home_dir / ".pg_service.conf"  # Standard dot-prefixed location
-    if home_path.exists():
-        logger.debug(f"Using pg_service.conf from home directory: {home_path}")
-        return home_path
-    
-    # Also check for non-dot-prefixed version in home
-    alt_home_path = home_dir / "pg_service.conf"
-    if alt_home_path.exists():
-        logger.debug(f"Using pg_service.conf from home directory: {alt_home_path}")
-        return alt_home_path
-    
-    # If we get here, we couldn't find the file
-    # Return the default location in the current directory
-    logger.warning("pg_service.conf not found in any standard location, using current directory")
-    return current_path  # Return the current directory location even if it doesn't exist
+# Hand records to the file handler through a queue so that logging inside the
+# audit loops does not block on disk writes
+log_queue = queue.Queue(-1)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Stack traces are written to the results log only, never rendered on the console
+trace_logger = logging.getLogger("dbaudit.trace")
+trace_logger.propagate = False
+trace_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+@functools.lru_cache(maxsize=4)
+def _load_parser(path_str, mtime_ns):
+    """Parse pg_service.conf once per (path, modification time)"""
+    return PgServiceConfigParser(path_str)
 
 # Function to get a database connection based on CLI parameters
 def get_connection(ctx_obj):
     """Get database connection from context object"""
+    from utils.connection import get_pooled_connection
+    
     service = ctx_obj.get("service")
     
     # If service name is provided, use pg_service.conf
@@ -159,15 +143,15 @@ def get_connection(ctx_obj):
             )
             
         try:
-            pg_service_parser = PgServiceConfigParser(pg_service_path)
+            pg_service_parser = _load_parser(str(pg_service_path), pg_service_path.stat().st_mtime_ns)
             service_config = pg_service_parser.get_service_config(service)
             
             # Store in context for other commands to use
             ctx_obj["service_config"] = service_config
             
-            return PostgresConnection(service_config)
+            return get_pooled_connection(service_config)
         except KeyError:
-            available = ", ".join(pg_service_parser.get_available_services())
+            available = ", ".join(sorted(pg_service_parser.iter_services()))
             raise KeyError(
                 f"Service '{service}' not found in pg_service.conf. "
                 f"Available services: {available or 'none'}"
@@ -184,13 +168,8 @@ def get_connection(ctx_obj):
     password = ctx_obj.get("password")
     
     # Validate required parameters
-    missing = []
-    if not host:
-        missing.append("host")
-    if not dbname:
-        missing.append("dbname")
-    if not username:
-        missing.append("username")
+    required = (("host", host), ("dbname", dbname), ("username", username))
+    missing = [name for name, value in required if not value]
     
     if missing:
         raise ValueError(
@@ -210,10 +189,51 @@ def get_connection(ctx_obj):
     # Store in context for other commands to use
     ctx_obj["service_config"] = service_config
     
-    return PostgresConnection(service_config)
+    return get_pooled_connection(service_config)
+
+# Risk level values selected by each --risk-level choice, in the order
+# PermissionAuditor.run_audit expects them
+RISK_LEVEL_VALUES = {
+    "all": ("high", "medium", "low"),
+    "high": ("high",),
+    "medium": ("medium",),
+    "low": ("low",)
+}
+
+# Seconds for which a completed audit can be reused by a later fix
+AUDIT_CACHE_TTL = 60
+
+# Audits run by fix, keyed on connection settings and risk levels. Kept at
+# module level because ctx.obj is new for every command line. The audit
+# command never reads it, so reports are always live.
+_audit_cache = {}
+
+def get_cached_audit(service_config, risk_levels, run_audit):
+    """Return a recent audit for these connection settings and risk levels, running one if needed"""
+    key = (
+        service_config.host,
+        str(service_config.port),
+        service_config.dbname,
+        service_config.user,
+        tuple(risk_levels)
+    )
+    
+    cached = _audit_cache.get(key)
+    if cached and time.monotonic() - cached[0] < AUDIT_CACHE_TTL:
+        logger.debug("Reusing audit result for %s", service_config.dbname)
+        return cached[1]
+    
+    audit_result = run_audit(risk_levels=list(risk_levels))
+    _audit_cache[key] = (time.monotonic(), audit_result)
+    return audit_result
+
+def invalidate_audit_cache():
+    """Forget cached audits once permissions may have changed"""
+    _audit_cache.clear()
 
 # Click group for command-line interface
 @click.group(name="cli")
+@click.version_option(__version__, "-v", "--version", prog_name="dbaudit")
 @click.option(
     "--service",
     help="Service name from pg_service.conf",
@@ -275,10 +295,11 @@ def cli(ctx, service, host, port, dbname, username, password, verbose, dry_run,
     ctx.obj["dry_run"] = dry_run
     ctx.obj["risk_level"] = risk_level
     
-    # Set up verbose logging if requested
-    if verbose:
-        logger.setLevel(logging.DEBUG)
-        logger.debug("Verbose mode enabled")
+    # Set the level on every call: menu audits run in-process, so a level
+    # left at DEBUG by one --verbose run would carry into later runs.
+    # Nothing is logged here: the log directory is only created once a
+    # command body runs, which --help never reaches.
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
 
 @cli.command()
 @click.option(
@@ -314,8 +335,12 @@ def cli(ctx, service, host, port, dbname, username, password, verbose, dry_run,
 @click.pass_context
 def audit(ctx, output, format, risk_level, summary, focus, verbose):
     """Audit database permissions and generate a report"""
+    from utils.audit import PermissionAuditor, PermissionRisk
+    
+    ensure_directories_exist()
+    
     # If command-line verbose flag is set, override context
-    if verbose:
+    if verbose or ctx.obj.get('verbose'):
         ctx.obj['verbose'] = True
         logger.setLevel(logging.DEBUG)
         logger.debug("Verbose mode enabled")
@@ -325,13 +350,7 @@ def audit(ctx, output, format, risk_level, summary, focus, verbose):
         risk_level = ctx.obj.get('risk_level', 'all')
     
     # Configure risk levels for filtering
-    risk_levels = []
-    if risk_level == 'high' or risk_level == 'all':
-        risk_levels.append(PermissionRisk.HIGH)
-    if risk_level == 'medium' or risk_level == 'all':
-        risk_levels.append(PermissionRisk.MEDIUM)
-    if risk_level == 'low' or risk_level == 'all':
-        risk_levels.append(PermissionRisk.LOW)
+    risk_levels = [PermissionRisk(value) for value in RISK_LEVEL_VALUES[risk_level]]
     
     # Run the audit
     try:
@@ -350,41 +369,38 @@ def audit(ctx, output, format, risk_level, summary, focus, verbose):
         
         logger.info(f"Starting permission audit for {ctx.obj.get('service', '')}...")
         
-        # Run the audit with filtered risk levels
+        # An explicit audit always queries the database; it also retires any
+        # audit a fix in this process might otherwise have reused
+        invalidate_audit_cache()
         audit_result = auditor.run_audit(risk_levels=risk_levels)
         
+        # Bucket permissions by risk level in a single pass
+        buckets = {"high": [], "medium": [], "low": []}
+        for p in audit_result.dangerous_permissions:
+            buckets.setdefault(p["risk_level"], []).append(p)
+        
         # Filter by risk level if needed
         if risk_level != "all":
-            if risk_level == "high":
-                audit_result.dangerous_permissions = [
-                    p for p in audit_result.dangerous_permissions 
-                    if p["risk_level"] == "high"
-                ]
-            elif risk_level == "medium":
-                audit_result.dangerous_permissions = [
-                    p for p in audit_result.dangerous_permissions 
-                    if p["risk_level"] == "medium"
-                ]
-            elif risk_level == "low":
-                audit_result.dangerous_permissions = [
-                    p for p in audit_result.dangerous_permissions 
-                    if p["risk_level"] == "low"
-                ]
+            audit_result.dangerous_permissions = buckets[risk_level]
+            buckets = {level: (perms if level == risk_level else []) for level, perms in buckets.items()}
+        
+        high_risk = buckets["high"]
+        medium_risk = buckets["medium"]
+        low_risk = buckets["low"]
         
         # Display results
         logger.info(f"Audit complete. Found {len(audit_result.dangerous_permissions)} potential security issues.")
         
         # Log detailed results
-        high_risk = [p for p in audit_result.dangerous_permissions if p["risk_level"] == "high"]
-        medium_risk = [p for p in audit_result.dangerous_permissions if p["risk_level"] == "medium"]
-        low_risk = [p for p in audit_result.dangerous_permissions if p["risk_level"] == "low"]
-        
         logger.info(f"High Risk Issues: {len(high_risk)}")
         logger.info(f"Medium Risk Issues: {len(medium_risk)}")
         logger.info(f"Low Risk Issues: {len(low_risk)}")
         
+        # Materialise the roles once; every report section below reuses them
+        role_items = list(audit_result.roles.items())
+        superusers = [name for name, role in role_items if role.is_superuser]
+        
         # Log superusers
-        superusers = [name for name, role in audit_result.roles.items() if role.is_superuser]
         logger.info(f"Superuser Roles: {', '.join(superusers)}")
         
         # Log top 5 high risk issues as examples
@@ -395,30 +411,25 @@ def audit(ctx, output, format, risk_level, summary, focus, verbose):
         
         # Display report to console
         if summary:
-            console.print("\n[bold blue]AUDIT SUMMARY[/bold blue]")
-            console.print("=" * 50)
+            console.print(_SUMMARY_HEADER)
+            console.print("=" * 50, markup=False)
             
             # Display superusers
-            console.print("\n[bold]Superuser Roles:[/bold]")
-            for role_name, role in audit_result.roles.items():
-                if role.is_superuser:
-                    console.print(f"  - {role_name}")
+            console.print(_SUPERUSERS_LABEL)
+            for role_name in superusers:
+                console.print(f"  - {role_name}")
             
             # Display dangerous permissions by risk level
-            high_risk = [p for p in audit_result.dangerous_permissions if p["risk_level"] == "high"]
-            medium_risk = [p for p in audit_result.dangerous_permissions if p["risk_level"] == "medium"]
-            low_risk = [p for p in audit_result.dangerous_permissions if p["risk_level"] == "low"]
-            
-            console.print(f"\n[bold]Permission Issues:[/bold]")
-            console.print(f"  [bold red]High Risk:[/bold red] {len(high_risk)}")
-            console.print(f"  [bold yellow]Medium Risk:[/bold yellow] {len(medium_risk)}")
-            console.print(f"  [bold green]Low Risk:[/bold green] {len(low_risk)}")
+            console.print(_ISSUES_LABEL)
+            console.print(_HIGH_LABEL, len(high_risk))
+            console.print(_MEDIUM_LABEL, len(medium_risk))
+            console.print(_LOW_LABEL, len(low_risk))
             
             # Display focused information based on the focus parameter
             if focus != "all":
                 console.print(f"\n[bold]Focus: {focus.upper()}[/bold]")
                 if focus == "roles":
-                    for role_name, role in audit_result.roles.items():
+                    for role_name, role in role_items:
                         console.print(f"  - {role_name} (Superuser: {role.is_superuser})")
                 elif focus == "schemas":
                     for schema_name, schema in audit_result.schemas.items():
@@ -431,45 +442,69 @@ def audit(ctx, output, format, risk_level, summary, focus, verbose):
                         console.print(f"  - {perm['type']} {perm['name']}: {perm['privilege']} granted to {perm['grantee']} (Risk: {perm['risk_level']})")
         else:
             # Detailed report
-            console.print("\n[bold blue]DETAILED AUDIT REPORT[/bold blue]")
-            console.print("=" * 50)
+            console.print(_DETAILED_HEADER)
+            console.print("=" * 50, markup=False)
             
-            # Display all information
-            console.print("\n[bold]Database Roles:[/bold]")
-            for role_name, role in audit_result.roles.items():
-                console.print(f"  - {role_name}")
-                console.print(f"    Superuser: {role.is_superuser}")
-                console.print(f"    Can login: {role.can_login}")
-                console.print(f"    Can create DB: {role.can_create_db}")
-                console.print(f"    Can create role: {role.can_create_role}")
-                if role.member_of:
-                    console.print(f"    Member of: {', '.join(role.member_of)}")
+            # Display all information, one table per section
+            roles_table = Table(title="Database Roles")
+            roles_table.add_column("Role", style="cyan")
+            roles_table.add_column("Superuser", style="red")
+            roles_table.add_column("Can login")
+            roles_table.add_column("Can create DB", style="yellow")
+            roles_table.add_column("Can create role", style="yellow")
+            roles_table.add_column("Member of", style="green")
+            for role_name, role in role_items:
+                roles_table.add_row(
+                    role_name,
+                    str(role.is_superuser),
+                    str(role.can_login),
+                    str(role.can_create_db),
+                    str(role.can_create_role),
+                    ", ".join(role.member_of)
+                )
+            console.print()
+            console.print(roles_table)
             
-            console.print("\n[bold]Schemas:[/bold]")
+            schemas_table = Table(title="Schemas")
+            schemas_table.add_column("Schema", style="cyan")
+            schemas_table.add_column("Owner", style="yellow")
+            schemas_table.add_column("Grantee", style="bold")
+            schemas_table.add_column("Privileges", style="green")
             for schema_name, schema in audit_result.schemas.items():
-                console.print(f"  - {schema_name} (Owner: {schema.owner})")
-                if schema.permissions:
-                    console.print("    Permissions:")
-                    for grantee, privs in schema.permissions.items():
-                        console.print(f"      {grantee}: {', '.join(privs)}")
+                if not schema.permissions:
+                    schemas_table.add_row(schema_name, schema.owner, "", "")
+                for grantee, privs in schema.permissions.items():
+                    schemas_table.add_row(schema_name, schema.owner, grantee, ", ".join(privs))
+            console.print()
+            console.print(schemas_table)
             
-            console.print("\n[bold]Tables with Dangerous Permissions:[/bold]")
-            dangerous_tables = set(p["name"] for p in audit_result.dangerous_permissions if p["type"] == "table")
+            tables_table = Table(title="Tables with Dangerous Permissions")
+            tables_table.add_column("Table", style="cyan")
+            tables_table.add_column("Owner", style="yellow")
+            tables_table.add_column("Grantee", style="bold")
+            tables_table.add_column("Privileges", style="red")
+            # dict.fromkeys dedups while keeping the order findings were reported in
+            dangerous_tables = dict.fromkeys(p["name"] for p in audit_result.dangerous_permissions if p["type"] == "table")
             for table_name in dangerous_tables:
-                if table_name in audit_result.tables:
-                    table = audit_result.tables[table_name]
-                    console.print(f"  - {table_name} (Owner: {table.owner})")
-                    if table.permissions:
-                        console.print("    Permissions:")
-                        for grantee, privs in table.permissions.items():
-                            console.print(f"      {grantee}: {', '.join(privs)}")
+                table = audit_result.tables.get(table_name)
+                if table is None:
+                    continue
+                if not table.permissions:
+                    tables_table.add_row(table_name, table.owner, "", "")
+                for grantee, privs in table.permissions.items():
+                    tables_table.add_row(table_name, table.owner, grantee, ", ".join(privs))
+            console.print()
+            console.print(tables_table)
+        
+        # Capture the report time once for the filename and the report body
+        now = datetime.now()
         
         # Save to file if output is specified
         if output:
             output_file = output
         else:
             # Generate default filename
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             db_name = audit_result.database or "unknown"
             if format == "json":
                 output_file = os.path.join("data", "audit_results", f"audit_{db_name}_{timestamp}.json")
@@ -487,38 +522,41 @@ def audit(ctx, output, format, risk_level, summary, focus, verbose):
             report_data = {
                 "database": audit_result.database,
                 "service": ctx.obj.get('service', ''),
-                "timestamp": datetime.datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "roles": [{"name": name, "is_superuser": role.is_superuser} 
-                         for name, role in audit_result.roles.items()],
+                         for name, role in role_items],
                 "dangerous_permissions": audit_result.dangerous_permissions,
                 "schemas": [{"name": name, "owner": schema.owner} 
                            for name, schema in audit_result.schemas.items()],
                 "tables": [{"name": name, "owner": table.owner} 
                           for name, table in audit_result.tables.items()]
             }
-            with open(output_file, "w") as f:
-                json.dump(report_data, f, indent=2)
+            if orjson is not None:
+                with open(output_file, "wb") as f:
+                    f.write(orjson.dumps(report_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(output_file, "w") as f:
+                    json.dump(report_data, f, indent=2)
         else:
-            # Save as text
-            report_text = f"PostgreSQL Database Permissions Audit Report\n"
-            report_text += f"Database: {audit_result.database}\n"
-            report_text += f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            
-            report_text += "SUPERUSER ROLES\n"
-            report_text += "==============\n"
-            for role_name, role in audit_result.roles.items():
-                if role.is_superuser:
-                    report_text += f"- {role_name}\n"
-            
-            report_text += "\nDANGEROUS PERMISSIONS\n"
-            report_text +=("====================\n")
-            for perm in audit_result.dangerous_permissions:
-                report_text += f"- {perm['type']} {perm['name']}: {perm['privilege']} granted to {perm['grantee']} (Risk: {perm['risk_level']})\n"
-            
-            with open(output_file, "w") as f:
-                f.write(report_text)
+            # Save as text, streaming the lines through a large write buffer
+            with open(output_file, "w", buffering=1024 * 1024) as f:
+                f.writelines((
+                    "PostgreSQL Database Permissions Audit Report\n",
+                    f"Database: {audit_result.database}\n",
+                    f"Date: {now.strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+                    "SUPERUSER ROLES\n",
+                    "==============\n"
+                ))
+                f.writelines(f"- {role_name}\n" for role_name in superusers)
+                
+                f.writelines(("\nDANGEROUS PERMISSIONS\n", "====================\n"))
+                f.writelines(
+                    f"- {perm['type']} {perm['name']}: {perm['privilege']} granted to {perm['grantee']} (Risk: {perm['risk_level']})\n"
+                    for perm in audit_result.dangerous_permissions
+                )
         
         console.print(f"\n[green]Audit results saved to: {output_file}[/green]")
+        return audit_result
     
     except Exception as e:
         logger.error(f"Audit failed: {e}")
@@ -559,6 +597,10 @@ def restore(ctx, backup_id, backup_file, backup_dir, no_confirm):
     
     CAUTION: This will overwrite data in the target database!
     """
+    from utils.backup import BackupManager
+    
+    ensure_directories_exist()
+    
     service = ctx.obj.get("service")
     if not service:
         logger.error("No service specified. Use --service option.")
@@ -570,10 +612,13 @@ def restore(ctx, backup_id, backup_file, backup_dir, no_confirm):
         console.print(f"  [bold]python dbaudit.py --service {service} backup --list[/bold]")
         return
     
-    service_config = ctx.obj.get("service_config")
     dry_run = ctx.obj.get("dry_run", False)
     
     try:
+        # Resolve the service configuration (the connection is only opened on demand)
+        get_connection(ctx.obj)
+        service_config = ctx.obj["service_config"]
+        
         # Create backup manager
         backup_manager = BackupManager(service_config, backup_dir, console)
         
@@ -619,7 +664,6 @@ def restore(ctx, backup_id, backup_file, backup_dir, no_confirm):
     except Exception as e:
         logger.error(f"Restore operation failed: {e}")
         if ctx.obj.get("verbose"):
-            import traceback
             console.print_exception()
         sys.exit(1)
 
@@ -687,12 +731,16 @@ def fix(ctx, fix_type, template, role, auto, backup, backup_type, export_scripts
     By default, a backup is created before applying fixes, and
     SQL scripts are exported for both the fix and rollback operations.
     """
+    from utils.audit import PermissionAuditor, PermissionRisk
+    from utils.fixes import PermissionFixer
+    
+    ensure_directories_exist()
+    
     service = ctx.obj.get("service")
     if not service:
         logger.error("No service specified. Use --service option.")
         sys.exit(1)
     
-    service_config = ctx.obj.get("service_config")
     dry_run = ctx.obj.get("dry_run", False)
     
     # Validate template if using apply_template
@@ -702,20 +750,45 @@ def fix(ctx, fix_type, template, role, auto, backup, backup_type, export_scripts
         sys.exit(1)
     
     try:
-        # Create a backup first if requested
+        # Resolve the pooled connection once and reuse it for the whole fix run
+        conn_manager = get_connection(ctx.obj)
+        service_config = ctx.obj["service_config"]
+        
+        # Connect to database and prepare the audit
+        conn = conn_manager.connect()
+        auditor = PermissionAuditor(conn, console)
+        if ctx.obj.get("verbose", False):
+            auditor.set_verbose(True)
+        
+        # The pre-fix backup (pg_dump) and the audit queries are independent,
+        # so run them side by side and wait for both before fixing anything
         backup_id = None
-        if backup and not dry_run:
-            from utils.backup import BackupManager
-            
-            console.print(f"\n[bold]Creating {backup_type} backup before applying fixes...[/bold]")
-            backup_manager = BackupManager(service_config, console=console)
+        backup_future = None
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            if backup and not dry_run:
+                from utils.backup import BackupManager
+                
+                console.print(f"\n[bold]Creating {backup_type} backup before applying fixes...[/bold]")
+                backup_manager = BackupManager(service_config, console=console)
+                backup_future = executor.submit(
+                    backup_manager.create_backup,
+                    backup_type=backup_type,
+                    custom_name=f"pre_fix_{fix_type}",
+                    dry_run=dry_run
+                )
             
-            backup_info = backup_manager.create_backup(
-                backup_type=backup_type,
-                custom_name=f"pre_fix_{fix_type}",
-                dry_run=dry_run
-            )
+            # First run an audit to identify permissions issues. Only one live
+            # display can be drawn at a time, so the audit's progress bar is
+            # hidden while the backup spinner is showing.
+            logger.info(f"Running permission audit for {service}...")
+            all_risk_levels = [PermissionRisk(value) for value in RISK_LEVEL_VALUES["all"]]
+            audit_call = functools.partial(auditor.run_audit, show_progress=backup_future is None)
+            audit_future = executor.submit(get_cached_audit, service_config, all_risk_levels, audit_call)
             
+            backup_info = backup_future.result() if backup_future else None
+            audit_result = audit_future.result()
+        
+        if backup_future:
             if backup_info:
                 backup_id = backup_info.id
                 console.print(f"[green]✓ Backup created with ID: [bold]{backup_id}[/bold][/green]")
@@ -723,78 +796,94 @@ def fix(ctx, fix_type, template, role, auto, backup, backup_type, export_scripts
                 console.print(f"  [bold]python dbaudit.py --service {service} restore --id {backup_id}[/bold]\n")
             else:
                 console.print("[yellow]⚠️ Backup failed, proceeding without backup[/yellow]")
-        # Connect to database and run audit
-        with PostgresConnection(service_config) as conn:
-            # First run an audit to identify permissions issues
-            logger.info(f"Running permission audit for {service}...")
-            
-            auditor = PermissionAuditor(conn, console)
-            if ctx.obj.get("verbose", False):
-                auditor.set_verbose(True)
-            
-            audit_result = auditor.run_audit()
-            
-            # Initialize permission fixer
-            logger.info(f"Analyzing permission fixes for {service}...")
-            fixer = PermissionFixer(conn, console)
-            
-            # Determine changes based on fix type
-            changes = []
-            
-            if fix_type == "remove_dangerous":
-                # Identify dangerous permissions to remove
-                changes = fixer.identify_dangerous_permissions(
-                    audit_result=audit_result,
-                    roles=role if role else None
-                )
-            elif fix_type == "apply_template":
-                # Apply permission template
-                changes = fixer.generate_template_changes(
-                    template_name=template,
-                    roles=role if role else None
-                )
-            elif fix_type == "restrict_public":
-                # Restrict public schema permissions
-                changes = fixer.generate_public_schema_fixes()
-            
-            # No changes to apply
-            if not changes:
-                console.print("[yellow]No changes to apply. Database permissions already match requirements.[/yellow]")
-                return
-            
-            # Apply fixes
-            fix_result = fixer.apply_fixes(
-                changes=changes,
-                interactive=not auto,
-                dry_run=dry_run,
-                export_scripts=export_scripts,
-                export_dir=export_dir
+        
+        # Initialize permission fixer
+        logger.info(f"Analyzing permission fixes for {service}...")
+        fixer = PermissionFixer(conn, console)
+        
+        # Determine changes based on fix type
+        changes = []
+        
+        if fix_type == "remove_dangerous":
+            # Identify dangerous permissions to remove
+            changes = fixer.identify_dangerous_permissions(
+                audit_result=audit_result,
+                roles=role if role else None
+            )
+        elif fix_type == "apply_template":
+            # Apply permission template
+            changes = fixer.generate_template_changes(
+                template_name=template,
+                roles=role if role else None
             )
+        elif fix_type == "restrict_public":
+            # Restrict public schema permissions
+            changes = fixer.generate_public_schema_fixes()
+        
+        # No changes to apply
+        if not changes:
+            console.print("[yellow]No changes to apply. Database permissions already match requirements.[/yellow]")
+            return
+        
+        # Apply fixes
+        fix_result = fixer.apply_fixes(
+            changes=changes,
+            interactive=not auto,
+            dry_run=dry_run,
+            export_scripts=export_scripts,
+            export_dir=export_dir
+        )
+        
+        # Earlier audits no longer describe the database
+        if not dry_run and fix_result.changes_applied:
+            invalidate_audit_cache()
+        
+        # Show summary of results
+        if not dry_run and fix_result.changes_applied:
+            console.print(f"\n[bold green]✓ Successfully applied {len(fix_result.changes_applied)} permission changes[/bold green]")
             
-            # Show summary of results
+            if fix_result.errors:
+                console.print(f"[yellow]⚠️ {len(fix_result.errors)} errors occurred[/yellow]")
             
-            # Show summary of results
-            if not dry_run and fix_result.changes_applied:
-                console.print(f"\n[bold green]✓ Successfully applied {len(fix_result.changes_applied)} permission changes[/bold green]")
-                
-                if fix_result.errors:
-                    console.print(f"[yellow]⚠️ {len(fix_result.errors)} errors occurred[/yellow]")
-                
-                # Remind about backup
-                if backup_id:
-                    console.print(f"\n[bold]If you need to restore the database to its previous state:[/bold]")
-                    console.print(f"  [bold]python dbaudit.py --service {service} restore --id {backup_id}[/bold]")
-                
-                # Suggest running audit again
-                console.print(f"\n[blue]Tip: Run an audit again to verify the changes:[/blue]")
-                console.print(f"  [bold]python dbaudit.py --service {service} audit[/bold]")
+            # Remind about backup
+            if backup_id:
+                console.print(f"\n[bold]If you need to restore the database to its previous state:[/bold]")
+                console.print(f"  [bold]python dbaudit.py --service {service} restore --id {backup_id}[/bold]")
+            
+            # Suggest running audit again
+            console.print(f"\n[blue]Tip: Run an audit again to verify the changes:[/blue]")
+            console.print(f"  [bold]python dbaudit.py --service {service} audit[/bold]")
     
     except Exception as e:
         logger.error(f"Fix operation failed: {e}")
+        trace_logger.error("Fix operation failed", exc_info=True)
         if ctx.obj.get("verbose"):
+            # Show only the frame that raised; the full stack is in the log file
             import traceback
-            console.print_exception()
+            last_frame = traceback.extract_tb(e.__traceback__)[-1:]
+            console.print("".join(traceback.format_list(last_frame)).rstrip(), markup=False, highlight=False)
         sys.exit(1)
 
+def run_audit(service_name, risk_level="all", output_format="text", output_file=None):
+    """
+    Run the audit command in-process, as `dbaudit.py --service NAME audit`
+    would, and return the AuditResult (None if the audit failed)
+    """
+    args = ["--service", service_name, "audit", "--risk-level", risk_level, "--format", output_format]
+    if output_file:
+        args.extend(["--output", output_file])
+    
+    from utils.connection import close_all_connections
+    
+    try:
+        return cli.main(args=args, obj={}, standalone_mode=False)
+    except SystemExit:
+        # The command has already logged why it failed
+        return None
+    finally:
+        # Release the connection as the old audit subprocess did on exit, so
+        # nothing stays open (or idle in transaction) for the menu session
+        close_all_connections()
+
 if __name__ == "__main__":
     cli(obj={})
@@ -5,63 +5,165 @@ Helper script to list all PostgreSQL services defined in pg_service.conf
 
 import os
 import sys
+import json
+import argparse
+import hashlib
 import pathlib
-from rich.console import Console
-from rich.table import Table
+import tempfile
 
-from pg_service import PgServiceConfigParser
+from utils import __version__
+from pg_service import PgServiceConfigParser, find_pg_service_conf
 
-console = Console()
+# Column headings for the services table, in row tuple order
+SERVICE_COLUMNS = ("Service Name", "Host", "Port", "Database", "User")
 
-def main():
+# Keys used for each row in --json output
+JSON_FIELDS = ("service", "host", "port", "dbname", "user")
+
+# Bumped whenever the layout of the cached rows changes
+_CACHE_FORMAT = 3
+
+# Service counts above this are rendered without table edges or padding
+LARGE_LISTING_ROWS = 100
+
+def _cache_dir():
+    """Return the per-user cache directory, creating it private to the user"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_dir = pathlib.Path(base) / "pgaudussy"
+    cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return cache_dir
+
+def _services_cache_path(path):
+    """Return the per-user cache file for a given pg_service.conf"""
+    resolved = str(pathlib.Path(path).resolve())
+    digest = hashlib.sha1(resolved.encode("utf-8")).hexdigest()[:16]
+    return _cache_dir() / f"services_{digest}.json"
+
+def _owned_by_us(fd):
+    """Return True if the open file belongs to the current user"""
+    # Windows has no uids; the cache directory is already per-user there
+    if not hasattr(os, "getuid"):
+        return True
+    return os.fstat(fd).st_uid == os.getuid()
+
+def _service_rows(services):
+    """Flatten {name: ServiceConfig} into name-sorted rows in SERVICE_COLUMNS order"""
+    return [
+        (service_name, config.host, config.port, config.dbname, config.user)
+        for service_name, config in sorted(services.items())
+    ]
+
+def _load_service_rows_cached(path):
+    """
+    Return the service rows for pg_service.conf, reusing the JSON-cached rows
+    of an earlier run while the file is unchanged
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return _service_rows(PgServiceConfigParser(path).services)
+    
+    key = [_CACHE_FORMAT, stat.st_mtime_ns, stat.st_size]
+    try:
+        cache_path = _services_cache_path(path)
+    except OSError:
+        return _service_rows(PgServiceConfigParser(path).services)
+    
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            if _owned_by_us(f.fileno()):
+                cached = json.load(f)
+                if cached["key"] == key:
+                    return [tuple(row) for row in cached["rows"]]
+    except Exception:
+        pass  # Missing, stale or unreadable cache; parse the file instead
+    
+    rows = _service_rows(PgServiceConfigParser(path).services)
+    
+    # Write atomically so a concurrent run never reads a partial file
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=cache_path.name)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "rows": rows}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Caching is best effort
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+    
+    return rows
+
+def print_services_json(rows):
+    """Write the services to stdout as a JSON array, bypassing Rich"""
+    out = [dict(zip(JSON_FIELDS, row)) for row in rows]
+    sys.stdout.write(json.dumps(out))
+    sys.stdout.write("\n")
+
+def main(argv=None):
     """Main function to display PostgreSQL services"""
+    parser = argparse.ArgumentParser(description="List PostgreSQL services defined in pg_service.conf")
+    parser.add_argument("--json", action="store_true", help="Print the services as JSON instead of a table")
+    parser.add_argument("-v", "--version", action="version", version=f"list_services, version {__version__}")
+    args = parser.parse_args(argv)
+    
+    if args.json:
+        try:
+            rows = _load_service_rows_cached(find_pg_service_conf())
+        except Exception as e:
+            sys.stderr.write(f"Error: {e}\n")
+            return 1
+        print_services_json(rows)
+        return 0 if rows else 1
+    
+    from rich.console import Console
+    from rich.table import Table
+    
+    console = Console()
     console.print("\n[bold blue]PostgreSQL Services Available[/bold blue]")
     console.print("==================================\n")
     
     # Find pg_service.conf
-    from dbaudit import find_pg_service_conf
     pg_service_path = find_pg_service_conf()
     
     try:
-        # Parse the configuration file
-        pg_service_parser = PgServiceConfigParser(pg_service_path)
-        available_services = pg_service_parser.get_available_services()
+        # Parse the configuration file (or reuse the cached parse)
+        rows = _load_service_rows_cached(pg_service_path)
         
-        if not available_services:
+        if not rows:
             console.print("[yellow]No services found in pg_service.conf[/yellow]")
             console.print("Add service configurations to your pg_service.conf file first.")
             return 1
         
-        # Create a table for display
-        table = Table(show_header=True, header_style="bold")
-        table.add_column("Service Name")
-        table.add_column("Host")
-        table.add_column("Port")
-        table.add_column("Database")
-        table.add_column("User")
+        # Create a table for display; large listings use a compact layout
+        if len(rows) > LARGE_LISTING_ROWS:
+            table = Table(show_header=True, header_style="bold", show_edge=False,
+                          pad_edge=False, padding=(0, 1), expand=False)
+        else:
+            table = Table(show_header=True, header_style="bold")
+        add_column = table.add_column
+        for column in SERVICE_COLUMNS:
+            add_column(column)
         
-        for service_name in sorted(available_services):
-            config = pg_service_parser.get_service_config(service_name)
-            table.add_row(
-                service_name,
-                config.host,
-                config.port,
-                config.dbname,
-                config.user
-            )
+        add_row = table.add_row
+        for row in rows:
+            add_row(*row)
         
         console.print(table)
-        console.print(f"\n[green]Found {len(available_services)} PostgreSQL service(s)[/green]")
+        console.print(f"\n[green]Found {len(rows)} PostgreSQL service(s)[/green]")
         
         # Display usage instructions
         console.print("\n[bold]To audit a database:[/bold]")
-        console.print(f"python dbaudit.py --service <service_name> audit")
+        console.print("python dbaudit.py --service <service_name> audit")
         
         console.print("\n[bold]To create a backup before fixing permissions:[/bold]")
-        console.print(f"python dbaudit.py --service <service_name> backup")
+        console.print("python dbaudit.py --service <service_name> backup")
         
         console.print("\n[bold]To fix permissions:[/bold]")
-        console.print(f"python dbaudit.py --service <service_name> fix")
+        console.print("python dbaudit.py --service <service_name> fix")
         
         return 0
         
@@ -7,78 +7,298 @@ This module provides an interactive menu for the PostgreSQL database permissions
 
 import os
 import sys
+import stat
+import ast
 import pathlib
 import logging
+import functools
+import tempfile
 import subprocess
-import configparser
 from dataclasses import dataclass
 from typing import Optional, List
 from datetime import datetime as dt
 
 from rich.console import Console
-from rich.table import Table
+from rich.table import Table, Column
 from rich.prompt import Prompt, Confirm
 from rich.panel import Panel
-from rich.markdown import Markdown
-from rich.logging import RichHandler
+from rich.text import Text
+from rich.style import Style
 
-from pg_service import ServiceConfig
-from utils.backup import BackupManager, BackupInfo
-from utils.reports import ReportGenerator
+from pg_service import ServiceConfig, clear_pg_service_conf_cache
+
+# Header written to newly created pg_service.conf files
+PG_SERVICE_TEMPLATE = """# PostgreSQL Service Configuration File
+# Format: [service_name]
+#         host=hostname
+#         port=port
+#         dbname=database_name
+#         user=username
+#         password=password (optional)
+"""
+
+# Header written by Create New pg_service.conf, which documents sslmode as well
+NEW_PG_SERVICE_TEMPLATE = """# PostgreSQL service configuration file
+# Created by PostgreSQL Database Permissions Audit Tool
+# Format: [service_name]
+# host=hostname
+# port=5432
+# dbname=database_name
+# user=username
+# password=password
+# sslmode=require  # For remote connections
+
+"""
+
+# Contents of config/audit_settings.py before any setting has been changed
+AUDIT_SETTINGS_TEMPLATE = """# PostgreSQL Database Permissions Audit Tool Settings
+
+default_risk_level = "all"
+default_output_format = "text"
+log_results = True
+"""
+
+# Working directory at startup; the menu never changes directory, so the
+# project pg_service.conf path does not need a getcwd() call per lookup
+_CWD = os.getcwd()
+_DEFAULT_PG_SERVICE_PATH = pathlib.Path(_CWD, 'pg_service.conf')
+
+# Option lists for the fixed menus, parsed once and printed with a single console.print
+MAIN_MENU_TEXT = Text.from_markup("""[bold]Main Menu:[/bold]
+1. Run Database Audit
+2. Manage pg_service.conf
+3. Configure Audit Settings
+4. View Previous Audit Results
+5. Backup and Restore Databases
+6. Generate HTML Reports
+7. Exit
+""")
+
+PG_SERVICE_MENU_TEXT = Text.from_markup("""[bold]Options:[/bold]
+1. View Current Services
+2. Add New Service
+3. Edit Existing Service
+4. Create New pg_service.conf
+5. Return to Main Menu
+""")
+
+SETTINGS_MENU_TEXT = Text.from_markup("""[bold]Options:[/bold]
+1. Change Default Risk Level
+2. Change Default Output Format
+3. Toggle Result Logging
+4. Return to Main Menu
+""")
+
+RISK_LEVEL_MENU_TEXT = Text.from_markup("""
+[bold]Change Default Risk Level:[/bold]
+1. High (only critical issues)
+2. Medium (critical and moderate issues)
+3. Low (all issues including informational)
+4. All (include all findings)
+""")
+
+OUTPUT_FORMAT_MENU_TEXT = Text.from_markup("""
+[bold]Change Default Output Format:[/bold]
+1. Text (human-readable)
+2. JSON (machine-readable)
+""")
+
+BACKUP_MENU_TEXT = Text.from_markup("""[bold]Options:[/bold]
+1. Backup Database
+2. Restore Database to Same Service
+3. Restore Database to New Service
+4. List Available Backups
+5. Delete Backup
+6. Create New Service
+7. Return to Main Menu
+""")
+
+BACKUP_TYPE_MENU_TEXT = Text.from_markup("""
+[bold]Backup Type:[/bold]
+1. Full Backup (schema, data, and permissions)
+2. Schema Only (structure without data)
+3. Permissions Only (roles and grants)
+""")
+
+# Prompt choices for the fixed menus, built once rather than on every prompt
+SEVEN_OPTION_CHOICES = ["1", "2", "3", "4", "5", "6", "7"]
+FIVE_OPTION_CHOICES = ["1", "2", "3", "4", "5"]
+FOUR_OPTION_CHOICES = ["1", "2", "3", "4"]
+
+# Numbered answers for the risk level, output format and backup type prompts
+RISK_LEVEL_CHOICES = {"1": "high", "2": "medium", "3": "low", "4": "all"}
+RISK_PROMPT_CHOICES = list(RISK_LEVEL_CHOICES)
+FORMAT_PROMPT_CHOICES = ["1", "2"]
+BACKUP_TYPE_CHOICES = {"1": "full", "2": "schema", "3": "permissions"}
+BACKUP_TYPE_PROMPT_CHOICES = list(BACKUP_TYPE_CHOICES)
+
+@functools.lru_cache(maxsize=32)
+def _choices(n):
+    """Return the prompt choices "1" to str(n) for a numbered list"""
+    return tuple(str(i) for i in range(1, n + 1))
+
+def _parse_pg_service(path):
+    """
+    Parse pg_service.conf into {service: {key: value}}
+
+    The file only ever holds [service] headers, '#' comments and key=value
+    lines, so this skips configparser's interpolation and proxy objects.
+    Keys are lowercased as configparser did, and a service listed more than
+    once is read as one section. A missing or unreadable file yields no
+    services.
+    """
+    services = {}
+    try:
+        with open(path, 'r') as f:
+            lines = f.read().split('\n')
+    except OSError:
+        return services
+    
+    params = None
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == '#' or line[0] == ';':
+            continue
+        if line[0] == '[' and line[-1] == ']':
+            params = services.setdefault(line[1:-1].strip(), {})
+        elif params is not None:
+            key, sep, value = line.partition('=')
+            if sep:
+                params[key.strip().lower()] = value.strip()
+    return services
+
+def _format_pg_service(services):
+    """Serialize {service: {key: value}} back into pg_service.conf text"""
+    # libpq does not accept spaces around '=' in older releases
+    return "\n".join(
+        f"[{name}]\n" + "".join(f"{key}={value}\n" for key, value in params.items())
+        for name, params in services.items()
+    )
+
+def _merge_pg_service(text, services):
+    """
+    Apply {service: {key: value}} to existing pg_service.conf text
+
+    Comments, blank lines and unchanged key lines pass through as written.
+    Changed values are rewritten in place, keys missing from a section are
+    added after its last key line, and new services are appended. A service
+    listed more than once is folded into its first block, so an edit cannot
+    be overridden by a later block when the file is read back.
+    """
+    out = []
+    seen = set()
+    params = None
+    written = set()
+    insert_at = 0
+    # Set while inside a repeated block whose keys moved to the first block
+    folded = False
+
+    def add_missing():
+        missing = [f"{key}={value}\n" for key, value in params.items() if key not in written]
+        out[insert_at:insert_at] = missing
+
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        if stripped[:1] == '[' and stripped[-1:] == ']':
+            if params is not None:
+                add_missing()
+            name = stripped[1:-1].strip()
+            folded = name in seen and name in services
+            params = services.get(name) if name not in seen else None
+            seen.add(name)
+            written = set()
+            if folded:
+                continue
+            out.append(line)
+            insert_at = len(out)
+            continue
+        if folded and stripped and stripped[0] not in '#;' and '=' in stripped:
+            continue
+        if params is not None and stripped and stripped[0] not in '#;':
+            key, sep, value = stripped.partition('=')
+            key = key.strip().lower()
+            if sep and key in params:
+                if value.strip() != params[key]:
+                    line = f"{key}={params[key]}\n"
+                written.add(key)
+            if not line.endswith('\n'):
+                line += '\n'
+            out.append(line)
+            insert_at = len(out)
+            continue
+        out.append(line)
+    if params is not None:
+        add_missing()
+
+    new = {name: params for name, params in services.items() if name not in seen}
+    if new:
+        if out and not out[-1].endswith('\n'):
+            out.append('\n')
+        if out and out[-1].strip():
+            out.append('\n')
+        out.append(_format_pg_service(new))
+    return "".join(out)
 
 # Simplified PgServiceConfigParser implementation
 class PgServiceConfigParser:
     def __init__(self, config_path=None):
         # If a specific path is provided, use it
         if config_path:
-            self.config_path = config_path
+            self.config_path = pathlib.Path(config_path)
         else:
             # Otherwise, always use the pg_service.conf in the project directory
-            self.config_path = os.path.join(os.getcwd(), 'pg_service.conf')
+            self.config_path = self.default_path()
             
             # Create the file if it doesn't exist
-            if not os.path.exists(self.config_path):
-                with open(self.config_path, 'w') as f:
-                    f.write("""# PostgreSQL Service Configuration File
-# Format: [service_name]
-#         host=hostname
-#         port=port
-#         dbname=database_name
-#         user=username
-#         password=password (optional)
-""")
+            try:
+                with open(self.config_path, 'x') as f:
+                    f.write(PG_SERVICE_TEMPLATE)
+                # In-process audits look the file up through pg_service
+                clear_pg_service_conf_cache()
                 console.print(f"[yellow]Created new pg_service.conf file at: {self.config_path}[/yellow]")
+            except FileExistsError:
+                pass
         
-        self.config = configparser.ConfigParser()
-        if os.path.exists(self.config_path):
-            # Read the config file
-            self.config.read(self.config_path)
+        # Read the config file (a missing file leaves the configuration empty)
+        self.config = _parse_pg_service(self.config_path)
+        self._services = None
+    
+    @staticmethod
+    def default_path():
+        """Return the project pg_service.conf path without reading the file"""
+        return _DEFAULT_PG_SERVICE_PATH
     
     def get_services(self):
+        # Built once per parse; store_parser() resets it after the config changes
+        if self._services is not None:
+            return list(self._services)
+        
         services = []
-        for section in self.config.sections():
+        for section, params in self.config.items():
             # Create a ServiceConfig object with the service parameters
+            # (_parse_pg_service has already stripped the values)
             # Store the service name separately since ServiceConfig doesn't have a name field
             service = ServiceConfig(
-                host=self.config.get(section, 'host', fallback='localhost').strip(),
-                port=self.config.get(section, 'port', fallback='5432').strip(),
-                dbname=self.config.get(section, 'dbname', fallback='').strip(),
-                user=self.config.get(section, 'user', fallback='').strip(),
-                password=self.config.get(section, 'password', fallback=None)
+                host=params.get('host', 'localhost'),
+                port=params.get('port', '5432'),
+                dbname=params.get('dbname', ''),
+                user=params.get('user', ''),
+                password=params.get('password', None)
             )
             # Add the service name as an attribute
             service.name = section
             services.append(service)
-        return services
+        self._services = services
+        return list(services)
     
     def get_service(self, service_name):
         if service_name in self.config:
             section = self.config[service_name]
             service = ServiceConfig(
-                host=section.get('host', 'localhost').strip(),
-                port=section.get('port', '5432').strip(),
-                dbname=section.get('dbname', '').strip(),
-                user=section.get('user', '').strip(),
+                host=section.get('host', 'localhost'),
+                port=section.get('port', '5432'),
+                dbname=section.get('dbname', ''),
+                user=section.get('user', ''),
                 password=section.get('password', None)
             )
             # Add the service name as an attribute
@@ -87,27 +307,125 @@ class PgServiceConfigParser:
         return None
 
     def add_service(self, service_name, host, port, dbname, user, password=None):
-        if not service_name in self.config:
-            self.config.add_section(service_name)
-        
-        self.config[service_name]['host'] = host
-        self.config[service_name]['port'] = port
-        self.config[service_name]['dbname'] = dbname
-        self.config[service_name]['user'] = user
+        section = self.config.setdefault(service_name, {})
+        section['host'] = host
+        section['port'] = port
+        section['dbname'] = dbname
+        section['user'] = user
         if password:
-            self.config[service_name]['password'] = password
+            section['password'] = password
         
         # Save to file
-        with open(self.config_path, 'w') as f:
-            self.config.write(f)
+        write_config_atomic(self)
+
+def _atomic_write_text(path, text):
+    """Replace path with text via a sibling temporary file, so readers never see a partial file"""
+    path = pathlib.Path(path)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        # New files get the permissions a plain open() would have given them
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    
+    f = tempfile.NamedTemporaryFile('w', dir=path.parent, prefix=f'.{path.name}.', delete=False)
+    try:
+        with f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # NamedTemporaryFile creates the file 0600
+        os.chmod(f.name, mode)
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+        raise
+
+def write_config_atomic(parser):
+    """
+    Write a parser's services to its file via a temporary file and os.replace,
+    then keep the parser cached as the current contents of that file
+
+    Only the lines of changed services are rewritten; comments and the
+    rest of the file are kept as they are.
+    """
+    config_path = parser.config_path
+    try:
+        try:
+            with open(config_path, 'r') as f:
+                current = f.read()
+        except FileNotFoundError:
+            current = ""
+        _atomic_write_text(config_path, _merge_pg_service(current, parser.config))
+    except BaseException:
+        # The cached parser may hold edits that never reached the disk
+        invalidate_parser(config_path)
+        raise
+    store_parser(config_path, parser)
+    # The write may have created the file
+    clear_pg_service_conf_cache()
+
+# Parsed pg_service.conf files keyed by path, reused while the file's mtime and size are unchanged
+_PARSER_CACHE = {}
+
+def _file_signature(path):
+    """Return (mtime_ns, size) for path, or None if it cannot be stat'ed"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def _parser_cache_key(config_path):
+    """Return the cache key used for a pg_service.conf path"""
+    return str(config_path or PgServiceConfigParser.default_path())
+
+def get_parser(config_path=None, signature=None):
+    """
+    Return a PgServiceConfigParser for config_path, reparsing only when the file changes
+
+    Callers that have just stat'ed the file can pass its _file_signature()
+    to save a second stat.
+    """
+    key = _parser_cache_key(config_path)
+    if signature is None:
+        signature = _file_signature(key)
+    
+    cached = _PARSER_CACHE.get(key)
+    if cached is not None and signature is not None and cached[0] == signature:
+        return cached[1]
+    
+    parser = PgServiceConfigParser(config_path)
+    # The parser may have just created the file, so stat it again
+    store_parser(config_path, parser)
+    return parser
+
+def store_parser(config_path, parser):
+    """Cache parser as matching the current contents of config_path"""
+    key = _parser_cache_key(config_path)
+    parser._services = None
+    signature = _file_signature(key)
+    if signature is None:
+        _PARSER_CACHE.pop(key, None)
+    else:
+        _PARSER_CACHE[key] = (signature, parser)
+
+def invalidate_parser(config_path=None):
+    """Drop the cached parser for config_path after the file has been written"""
+    _PARSER_CACHE.pop(_parser_cache_key(config_path), None)
 
 # Function to get available services
 def get_available_services():
     """Get list of available services from pg_service.conf"""
-    pg_service_parser = PgServiceConfigParser()
+    pg_service_parser = get_parser()
     return [service.name for service in pg_service_parser.get_services()]
 
-# Ensure necessary directories exist
+# Ensure necessary directories exist (once per process, from _bootstrap)
+@functools.lru_cache(maxsize=1)
 def ensure_directories_exist():
     """Ensure that necessary directories exist and create required configuration files."""
     # Create directories
@@ -120,9 +438,19 @@ def ensure_directories_exist():
         'reports'  # Keep the original reports directory for backward compatibility
     ]
     
+    # One scandir per parent finds the directories that already exist, so
+    # makedirs only runs for the missing ones
+    existing = set()
+    for parent in ('.', 'data'):
+        try:
+            with os.scandir(parent) as entries:
+                existing.update(os.path.normpath(os.path.join(parent, e.name)) for e in entries if e.is_dir())
+        except FileNotFoundError:
+            pass
+    
     for directory in directories:
-        os.makedirs(directory, exist_ok=True)
-        print(f"Ensured directory exists: {directory}")
+        if os.path.normpath(directory) not in existing:
+            os.makedirs(directory, exist_ok=True)
     
     # Create default configuration files if they don't exist
     default_config_files = {
@@ -130,38 +458,71 @@ def ensure_directories_exist():
     }
     
     for file_path, content in default_config_files.items():
-        if not os.path.exists(file_path):
-            with open(file_path, 'w') as f:
+        try:
+            with open(file_path, 'x') as f:
                 f.write(content)
-            print(f"Created default configuration file: {file_path}")
-
-# Ensure directories exist at startup
-ensure_directories_exist()
+        except FileExistsError:
+            continue
+        print(f"Created default configuration file: {file_path}")
 
 # Configure rich console for better output
 console = Console()
 
-# Configure logging with rich
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    datefmt="[%X]",
-    handlers=[RichHandler(rich_tracebacks=True, console=console)]
-)
 logger = logging.getLogger("dbaudit_menu")
-
-# Also set up file logging
 log_file_path = os.path.join("data", "logs", "dbaudit_menu.log")
-file_handler = logging.FileHandler(log_file_path)
-file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-logger.addHandler(file_handler)
+
+_bootstrapped = False
+_file_handler = None
+
+def _bootstrap():
+    """Create the working directories and install log handlers on first use"""
+    global _bootstrapped
+    if _bootstrapped:
+        return
+    _bootstrapped = True
+    
+    ensure_directories_exist()
+    
+    # Configure logging with rich on a terminal; plain stderr output otherwise
+    # avoids importing Rich's logging and traceback machinery
+    if sys.stdout.isatty():
+        from rich.logging import RichHandler
+        handler = RichHandler(rich_tracebacks=True, console=console)
+    else:
+        handler = logging.StreamHandler()
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        datefmt="[%X]",
+        handlers=[handler]
+    )
+    
+    # Also set up file logging, unless a handler is already attached
+    if not logger.handlers:
+        set_file_logging(load_settings().get("log_results", True))
+
+def set_file_logging(enabled):
+    """Attach or detach the menu log file handler to follow the log_results setting"""
+    global _file_handler
+    if enabled and _file_handler is None:
+        # delay=True leaves the log file unopened until the first record
+        _file_handler = logging.FileHandler(log_file_path, delay=True)
+        _file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        logger.addHandler(_file_handler)
+    elif not enabled and _file_handler is not None:
+        logger.removeHandler(_file_handler)
+        _file_handler.close()
+        _file_handler = None
 
 def clear_screen():
     """Clear the terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    # Rich writes the ANSI clear sequence itself (and handles legacy Windows
+    # consoles), so no shell has to be spawned for every redraw
+    console.clear()
 
 def display_header():
     """Display the application header"""
+    _bootstrap()
     clear_screen()
     console.print(Panel.fit(
         "[bold blue]PostgreSQL Database Permissions Audit Tool[/bold blue]",
@@ -171,28 +532,19 @@ def display_header():
 
 def display_main_menu():
     """Display the main menu options"""
-    console.print("[bold]Main Menu:[/bold]")
-    console.print("1. Run Database Audit")
-    console.print("2. Manage pg_service.conf")
-    console.print("3. Configure Audit Settings")
-    console.print("4. View Previous Audit Results")
-    console.print("5. Backup and Restore Databases")
-    console.print("6. Generate HTML Reports")
-    console.print("7. Exit")
-    console.print()
+    console.print(MAIN_MENU_TEXT)
     
-    choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4", "5", "6", "7"], default="1")
+    choice = Prompt.ask("Select an option", choices=SEVEN_OPTION_CHOICES, default="1")
     return choice
 
 def run_audit_menu():
-    ensure_directories_exist()
     """Menu for running database audits"""
     display_header()
     console.print("[bold]Run Database Audit[/bold]")
     console.print()
     
     # Get available services
-    pg_service_parser = PgServiceConfigParser()
+    pg_service_parser = get_parser()
     pg_services = pg_service_parser.get_services()
     
     if not pg_services:
@@ -212,7 +564,7 @@ def run_audit_menu():
     # Get service selection
     choice = Prompt.ask(
         "Select a service", 
-        choices=[str(i) for i in range(1, len(pg_services) + 2)],
+        choices=list(_choices(len(pg_services) + 1)),
         default="1"
     )
     
@@ -230,14 +582,8 @@ def run_audit_menu():
     console.print("4. All (include all findings)")
     console.print()
     
-    risk_choice = Prompt.ask("Select risk level", choices=["1", "2", "3", "4"], default="4")
-    risk_levels = {
-        "1": "high",
-        "2": "medium",
-        "3": "low",
-        "4": "all"
-    }
-    risk_level = risk_levels[risk_choice]
+    risk_choice = Prompt.ask("Select risk level", choices=RISK_PROMPT_CHOICES, default="4")
+    risk_level = RISK_LEVEL_CHOICES[risk_choice]
     
     # Get output format
     console.print()
@@ -246,7 +592,7 @@ def run_audit_menu():
     console.print("2. JSON (machine-readable)")
     console.print()
     
-    format_choice = Prompt.ask("Select output format", choices=["1", "2"], default="1")
+    format_choice = Prompt.ask("Select output format", choices=FORMAT_PROMPT_CHOICES, default="1")
     output_format = "text" if format_choice == "1" else "json"
     
     # Generate output filename
@@ -265,47 +611,66 @@ def run_audit_menu():
     console.print()
     
     if Confirm.ask("Run audit with these settings?", default=True):
-        # Run the audit
+        # Run the audit in this process when dbaudit can be imported
+        try:
+            from dbaudit import run_audit
+        except ImportError:
+            run_audit = None
+        
         try:
-            cmd = ["python", "dbaudit.py", "--service", selected_service.name, "audit", "--risk-level", risk_level]
-            
-            if output_format == "json":
-                cmd.extend(["--format", "json"])
-            
-            cmd.extend(["--output", output_file])
-            
             logger.info(f"Starting audit for service: {selected_service.name}, risk level: {risk_level}")
             
-            # Run the command
             console.print()
             console.print("[bold]Running audit...[/bold]")
-            process = subprocess.run(cmd, capture_output=True, text=True)
+            if run_audit is not None:
+                succeeded = run_audit(selected_service.name, risk_level, output_format, output_file) is not None
+                error_output = None
+            else:
+                cmd = ["python", "dbaudit.py", "--service", selected_service.name, "audit", "--risk-level", risk_level]
+                
+                if output_format == "json":
+                    cmd.extend(["--format", "json"])
+                
+                cmd.extend(["--output", output_file])
+                
+                # Stream the audit's output as it runs; stderr goes to a temporary
+                # file so a chatty child cannot block on a full pipe
+                with tempfile.TemporaryFile('w+') as stderr_file:
+                    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True, bufsize=1)
+                    with process.stdout:
+                        for line in process.stdout:
+                            console.out(line, end="", highlight=False)
+                    succeeded = process.wait() == 0
+                    stderr_file.seek(0)
+                    error_output = stderr_file.read()
             
-            if process.returncode == 0:
+            if succeeded:
                 console.print()
                 console.print("[green]Audit completed successfully![/green]")
                 console.print(f"Results saved to: [cyan]{output_file}[/cyan]")
                 
-                # Display summary from the output
-                if os.path.exists(output_file):
-                    if output_format == "text":
-                        with open(output_file, 'r') as f:
-                            content = f.read()
-                            console.print(Panel(Markdown(content[:500] + "..." if len(content) > 500 else content)))
+                # Display a preview of text reports; only the first 500 characters are shown
+                if output_format == "text" and os.path.exists(output_file):
+                    with open(output_file, 'r') as f:
+                        content = f.read(501)
+                    # rich.markdown pulls in markdown-it, so it is only imported here
+                    from rich.markdown import Markdown
+                    console.print(Panel(Markdown(content[:500] + "..." if len(content) > 500 else content)))
                 
                 logger.info(f"Audit completed successfully for service: {selected_service.name}")
             else:
                 console.print()
                 console.print("[red]Audit failed![/red]")
                 
-                # Display error message
-                if process.stderr:
-                    console.print(process.stderr)
-                    logger.error(f"Audit failed for service: {selected_service.name}")
-                    logger.error(process.stderr)
+                logger.error(f"Audit failed for service: {selected_service.name}")
                 
-                if Confirm.ask("View error details?", default=True):
-                    console.print(process.stderr)
+                # In-process audits have already printed their errors above
+                if error_output:
+                    console.print(error_output)
+                    logger.error(error_output)
+                    
+                    if Confirm.ask("View error details?", default=True):
+                        console.print(error_output)
         except Exception as e:
             console.print(f"[red]Error running audit: {e}[/red]")
             logger.error(f"Error running audit: {e}")
@@ -315,57 +680,46 @@ def run_audit_menu():
     Prompt.ask("Press Enter to return to the main menu")
 
 def manage_pg_service_menu():
-    ensure_directories_exist()
     """Menu for managing pg_service.conf"""
-    display_header()
-    console.print("[bold]Manage pg_service.conf[/bold]")
-    console.print()
-    
-    # Find pg_service.conf
-    pg_service_path = PgServiceConfigParser().config_path
-    
-    console.print(f"Current pg_service.conf path: [cyan]{pg_service_path}[/cyan]")
-    console.print()
-    
-    console.print("[bold]Options:[/bold]")
-    console.print("1. View Current Services")
-    console.print("2. Add New Service")
-    console.print("3. Edit Existing Service")
-    console.print("4. Create New pg_service.conf")
-    console.print("5. Return to Main Menu")
-    console.print()
+    # Find pg_service.conf; the path alone needs no parse
+    pg_service_path = PgServiceConfigParser.default_path()
     
-    choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4", "5"], default="1")
-    
-    if choice == "1":
-        view_services(pg_service_path)
-    elif choice == "2":
-        add_service(pg_service_path)
-    elif choice == "3":
-        edit_service(pg_service_path)
-    elif choice == "4":
-        create_pg_service_conf()
-    
-    # Return to main menu
-    if choice != "5":
+    while True:
+        display_header()
+        console.print("[bold]Manage pg_service.conf[/bold]")
+        console.print()
+        
+        console.print(f"Current pg_service.conf path: [cyan]{pg_service_path}[/cyan]\n")
+        console.print(PG_SERVICE_MENU_TEXT)
+        
+        choice = Prompt.ask("Select an option", choices=FIVE_OPTION_CHOICES, default="1")
+        
+        if choice == "1":
+            view_services(pg_service_path)
+        elif choice == "2":
+            add_service(pg_service_path)
+        elif choice == "3":
+            edit_service(pg_service_path)
+        elif choice == "4":
+            create_pg_service_conf()
+        else:
+            # Return to main menu
+            return
+        
         Prompt.ask("Press Enter to return to the manage pg_service menu")
-        manage_pg_service_menu()
 
-def view_services(pg_service_path):
+def view_services(pg_service_path: pathlib.Path):
     """View services in pg_service.conf"""
     console.print()
     console.print("[bold]Services in pg_service.conf:[/bold]")
     
-    # Convert string path to Path object if needed
-    if isinstance(pg_service_path, str):
-        pg_service_path = pathlib.Path(pg_service_path)
-    
-    if not pg_service_path.exists():
+    signature = _file_signature(pg_service_path)
+    if signature is None:
         console.print("[yellow]pg_service.conf not found![/yellow]")
         return
     
     try:
-        parser = PgServiceConfigParser(pg_service_path)
+        parser = get_parser(pg_service_path, signature)
         services = parser.get_services()
         
         if not services:
@@ -395,32 +749,21 @@ def view_services(pg_service_path):
     except Exception as e:
         console.print(f"[red]Error reading pg_service.conf: {e}[/red]")
 
-def add_service(pg_service_path):
+def add_service(pg_service_path: pathlib.Path):
     """Add a new service to pg_service.conf"""
     display_header()
     console.print("[bold]Add New Service[/bold]")
     console.print()
     
-    # Convert string path to Path object if needed
-    if isinstance(pg_service_path, str):
-        pg_service_path = pathlib.Path(pg_service_path)
-    
-    if not pg_service_path.exists():
+    signature = _file_signature(pg_service_path)
+    if signature is None:
         if not Confirm.ask(f"pg_service.conf not found at {pg_service_path}. Create it?", default=True):
             return
         
         pg_service_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Create empty pg_service.conf with comments
-        with open(pg_service_path, 'w') as f:
-            f.write("""# PostgreSQL Service Configuration File
-# Format: [service_name]
-#         host=hostname
-#         port=port
-#         dbname=database_name
-#         user=username
-#         password=password (optional)
-""")
+        pg_service_path.write_text(PG_SERVICE_TEMPLATE)
     
     # Get service details
     service_name = Prompt.ask("Service Name")
@@ -448,28 +791,44 @@ def add_service(pg_service_path):
         return
     
     try:
-        # Read existing content
-        content = ""
-        if pg_service_path.exists():
-            with open(pg_service_path, 'r') as f:
-                content = f.read()
+        # Parsed before appending so the cached copy can be updated in place.
+        # The file may have changed while prompting, so it is stat'ed afresh.
+        parser = get_parser(pg_service_path)
         
-        # Add new service
-        with open(pg_service_path, 'w') as f:
-            f.write(content)
-            if content and not content.endswith('\n\n'):
-                f.write('\n\n')
-            
-            f.write(f"[{service_name}]\n")
-            f.write(f"host={host}\n")
-            f.write(f"port={port}\n")
-            f.write(f"dbname={dbname}\n")
-            f.write(f"user={user}\n")
-            f.write(f"password={password}\n")
-            
-            # Add sslmode if not localhost
-            if host != "localhost" and host != "127.0.0.1":
-                f.write("sslmode=require\n")
+        # Only the end of the existing file matters for the separator
+        try:
+            with open(pg_service_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(f.tell() - 2, 0))
+                tail = f.read()
+        except FileNotFoundError:
+            tail = b""
+        
+        params = {
+            'host': host,
+            'port': port,
+            'dbname': dbname,
+            'user': user,
+            'password': password
+        }
+        
+        # Add sslmode if not localhost
+        if host != "localhost" and host != "127.0.0.1":
+            params['sslmode'] = 'require'
+        
+        block = _format_pg_service({service_name: params})
+        
+        # Leave exactly one blank line between the previous section and this one
+        if tail and not tail.endswith(b'\n\n'):
+            block = ('\n' if tail.endswith(b'\n') else '\n\n') + block
+        
+        # Append the new service in a single write
+        with open(pg_service_path, 'a') as f:
+            f.write(block)
+        
+        # Write through to the cached parse instead of re-reading the file
+        parser.config.setdefault(service_name, {}).update(params)
+        store_parser(pg_service_path, parser)
         
         console.print("[green]Service added successfully![/green]")
         
@@ -493,21 +852,18 @@ def add_service(pg_service_path):
         console.print(f"[red]Error adding service: {e}[/red]")
         logger.error(f"Error adding service: {e}")
 
-def edit_service(pg_service_path):
+def edit_service(pg_service_path: pathlib.Path):
     """Edit an existing service in pg_service.conf"""
     console.print()
     console.print("[bold]Edit Existing Service:[/bold]")
     
-    # Convert string path to Path object if needed
-    if isinstance(pg_service_path, str):
-        pg_service_path = pathlib.Path(pg_service_path)
-    
-    if not pg_service_path.exists():
+    signature = _file_signature(pg_service_path)
+    if signature is None:
         console.print("[yellow]pg_service.conf not found![/yellow]")
         return
     
     try:
-        parser = PgServiceConfigParser(pg_service_path)
+        parser = get_parser(pg_service_path, signature)
         services = parser.get_services()
         
         if not services:
@@ -524,7 +880,7 @@ def edit_service(pg_service_path):
         # Get service selection
         choice = Prompt.ask(
             "Select a service to edit", 
-            choices=[str(i) for i in range(1, len(services) + 2)],
+            choices=list(_choices(len(services) + 1)),
             default="1"
         )
         
@@ -564,42 +920,16 @@ def edit_service(pg_service_path):
         
         if Confirm.ask("Save these changes?", default=True):
             try:
-                # Read the file
-                with open(pg_service_path, 'r') as f:
-                    lines = f.readlines()
-                
-                # Find and update the service
-                in_service = False
-                updated_lines = []
+                # Update the already parsed section and write the file once
+                section = parser.config[selected_service.name]
+                section['host'] = host
+                section['port'] = port
+                section['dbname'] = dbname
+                section['user'] = user
+                if password is not None:
+                    section['password'] = password
                 
-                for line in lines:
-                    if line.strip() == f"[{selected_service.name}]":
-                        in_service = True
-                        updated_lines.append(line)
-                    elif in_service and line.strip().startswith('['):
-                        # We've reached the next service
-                        in_service = False
-                        updated_lines.append(line)
-                    elif in_service:
-                        # Update the service parameters
-                        if line.strip().startswith('host='):
-                            updated_lines.append(f"host={host}\n")
-                        elif line.strip().startswith('port='):
-                            updated_lines.append(f"port={port}\n")
-                        elif line.strip().startswith('dbname='):
-                            updated_lines.append(f"dbname={dbname}\n")
-                        elif line.strip().startswith('user='):
-                            updated_lines.append(f"user={user}\n")
-                        elif line.strip().startswith('password='):
-                            updated_lines.append(f"password={password}\n")
-                        else:
-                            updated_lines.append(line)
-                    else:
-                        updated_lines.append(line)
-                
-                # Write back to the file
-                with open(pg_service_path, 'w') as f:
-                    f.writelines(updated_lines)
+                write_config_atomic(parser)
                 
                 console.print("[green]Service updated successfully![/green]")
                 
@@ -624,7 +954,7 @@ def create_pg_service_conf():
     console.print("4. Cancel")
     console.print()
     
-    choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4"], default="1")
+    choice = Prompt.ask("Select an option", choices=FOUR_OPTION_CHOICES, default="1")
     
     if choice == "4":
         return
@@ -647,16 +977,10 @@ def create_pg_service_conf():
     
     # Create the file
     try:
-        with open(path, 'w') as f:
-            f.write("# PostgreSQL service configuration file\n")
-            f.write("# Created by PostgreSQL Database Permissions Audit Tool\n")
-            f.write("# Format: [service_name]\n")
-            f.write("# host=hostname\n")
-            f.write("# port=5432\n")
-            f.write("# dbname=database_name\n")
-            f.write("# user=username\n")
-            f.write("# password=password\n")
-            f.write("# sslmode=require  # For remote connections\n\n")
+        _atomic_write_text(path, NEW_PG_SERVICE_TEMPLATE)
+        
+        invalidate_parser(path)
+        clear_pg_service_conf_cache()
         
         console.print(f"[green]Created pg_service.conf at: {path}[/green]")
         console.print("You can now add services to this file.")
@@ -672,92 +996,118 @@ def create_pg_service_conf():
         logger.error(f"Error creating pg_service.conf: {e}")
 
 def configure_audit_settings():
-    ensure_directories_exist()
     """Configure audit settings"""
-    display_header()
-    console.print("[bold]Configure Audit Settings[/bold]")
-    console.print()
-    
-    # Load current settings
-    settings = load_settings()
-    
-    console.print("[bold]Current Settings:[/bold]")
-    console.print(f"Default Risk Level: [cyan]{settings.get('default_risk_level', 'all')}[/cyan]")
-    console.print(f"Default Output Format: [cyan]{settings.get('default_output_format', 'text')}[/cyan]")
-    console.print(f"Log Results: [cyan]{settings.get('log_results', True)}[/cyan]")
-    console.print()
-    
-    console.print("[bold]Options:[/bold]")
-    console.print("1. Change Default Risk Level")
-    console.print("2. Change Default Output Format")
-    console.print("3. Toggle Result Logging")
-    console.print("4. Return to Main Menu")
-    console.print()
-    
-    choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4"], default="1")
-    
-    if choice == "1":
-        change_risk_level(settings)
-    elif choice == "2":
-        change_output_format(settings)
-    elif choice == "3":
-        toggle_logging(settings)
-    
-    # Return to main menu
-    if choice != "4":
+    while True:
+        display_header()
+        console.print("[bold]Configure Audit Settings[/bold]")
+        console.print()
+        
+        # Load current settings
+        settings = load_settings()
+        
+        console.print(
+            "[bold]Current Settings:[/bold]\n"
+            f"Default Risk Level: [cyan]{settings.get('default_risk_level', 'all')}[/cyan]\n"
+            f"Default Output Format: [cyan]{settings.get('default_output_format', 'text')}[/cyan]\n"
+            f"Log Results: [cyan]{settings.get('log_results', True)}[/cyan]\n"
+        )
+        console.print(SETTINGS_MENU_TEXT)
+        
+        choice = Prompt.ask("Select an option", choices=FOUR_OPTION_CHOICES, default="1")
+        
+        if choice == "1":
+            change_risk_level(settings)
+        elif choice == "2":
+            change_output_format(settings)
+        elif choice == "3":
+            toggle_logging(settings)
+        else:
+            # Return to main menu
+            return
+        
         Prompt.ask("Press Enter to return to the settings menu")
-        configure_audit_settings()
+
+SETTINGS_PATH = pathlib.Path("config", "audit_settings.py")
+
+# Settings used when the file is missing or unreadable
+DEFAULT_SETTINGS = {
+    "default_risk_level": "all",
+    "default_output_format": "text",
+    "log_results": True
+}
+
+# (mtime_ns, settings) for the last audit_settings.py read or written
+_SETTINGS_CACHE = None
 
 def load_settings():
     """Load settings from file"""
-    settings_path = pathlib.Path("config/audit_settings.py")
+    global _SETTINGS_CACHE
+    settings_path = SETTINGS_PATH
     
-    default_settings = {
-        "default_risk_level": "all",
-        "default_output_format": "text",
-        "log_results": True
-    }
+    # A single stat answers both "does the file exist" and "is the cache current"
+    try:
+        mtime = settings_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        # Create the default settings file
+        try:
+            settings_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(settings_path, 'x') as f:
+                f.write(AUDIT_SETTINGS_TEMPLATE)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            logger.error(f"Error saving settings: {e}")
+        return dict(DEFAULT_SETTINGS)
+    except OSError as e:
+        logger.error(f"Error loading settings: {e}")
+        return dict(DEFAULT_SETTINGS)
     
-    if not settings_path.exists():
-        # Create default settings file
-        settings_path.parent.mkdir(parents=True, exist_ok=True)
-        save_settings(default_settings)
-        return default_settings
+    if _SETTINGS_CACHE is not None and _SETTINGS_CACHE[0] == mtime:
+        return dict(_SETTINGS_CACHE[1])
     
     try:
         # Load settings from file
         settings = {}
         with open(settings_path, 'r') as f:
             for line in f:
-                if '=' in line and not line.strip().startswith('#'):
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip().strip('"\'')
-                    
-                    # Convert string to boolean for log_results
-                    if key == "log_results":
-                        value = value.lower() == "true"
-                    
-                    settings[key] = value
+                key, sep, value = line.partition('=')
+                key = key.strip()
+                if not sep or key.startswith('#'):
+                    continue
+                value = value.strip()
+                try:
+                    value = ast.literal_eval(value)
+                except (ValueError, SyntaxError):
+                    value = value.strip('"\'')
+                
+                # Convert string to boolean for log_results
+                if key == "log_results" and isinstance(value, str):
+                    value = value.lower() == "true"
+                
+                settings[key] = value
         
-        return settings
+        _SETTINGS_CACHE = (mtime, settings)
+        return dict(settings)
     except Exception as e:
         logger.error(f"Error loading settings: {e}")
-        return default_settings
+        return dict(DEFAULT_SETTINGS)
 
 def save_settings(settings):
     """Save settings to file"""
-    settings_path = pathlib.Path("config/audit_settings.py")
+    global _SETTINGS_CACHE
+    settings_path = SETTINGS_PATH
     
     try:
-        with open(settings_path, 'w') as f:
-            f.write("# PostgreSQL Database Permissions Audit Tool Settings\n\n")
-            
-            for key, value in settings.items():
-                if isinstance(value, bool):
-                    f.write(f"{key} = {str(value)}\n")
-                else:
-                    f.write(f'{key} = "{value}"\n')
+        lines = ["# PostgreSQL Database Permissions Audit Tool Settings\n\n"]
+        for key, value in settings.items():
+            if isinstance(value, bool):
+                lines.append(f"{key} = {str(value)}\n")
+            else:
+                lines.append(f'{key} = "{value}"\n')
+        _atomic_write_text(settings_path, "".join(lines))
+        
+        # Keep load_settings from re-reading what was just written
+        _SETTINGS_CACHE = (settings_path.stat().st_mtime_ns, dict(settings))
         
         logger.info("Settings saved successfully")
     except Exception as e:
@@ -765,22 +1115,10 @@ def save_settings(settings):
 
 def change_risk_level(settings):
     """Change the default risk level"""
-    console.print()
-    console.print("[bold]Change Default Risk Level:[/bold]")
-    console.print("1. High (only critical issues)")
-    console.print("2. Medium (critical and moderate issues)")
-    console.print("3. Low (all issues including informational)")
-    console.print("4. All (include all findings)")
-    console.print()
+    console.print(RISK_LEVEL_MENU_TEXT)
     
-    choice = Prompt.ask("Select default risk level", choices=["1", "2", "3", "4"], default="4")
-    risk_levels = {
-        "1": "high",
-        "2": "medium",
-        "3": "low",
-        "4": "all"
-    }
-    risk_level = risk_levels[choice]
+    choice = Prompt.ask("Select default risk level", choices=RISK_PROMPT_CHOICES, default="4")
+    risk_level = RISK_LEVEL_CHOICES[choice]
     
     settings["default_risk_level"] = risk_level
     save_settings(settings)
@@ -789,13 +1127,9 @@ def change_risk_level(settings):
 
 def change_output_format(settings):
     """Change the default output format"""
-    console.print()
-    console.print("[bold]Change Default Output Format:[/bold]")
-    console.print("1. Text (human-readable)")
-    console.print("2. JSON (machine-readable)")
-    console.print()
+    console.print(OUTPUT_FORMAT_MENU_TEXT)
     
-    choice = Prompt.ask("Select default output format", choices=["1", "2"], default="1")
+    choice = Prompt.ask("Select default output format", choices=FORMAT_PROMPT_CHOICES, default="1")
     output_format = "text" if choice == "1" else "json"
     
     settings["default_output_format"] = output_format
@@ -810,54 +1144,98 @@ def toggle_logging(settings):
     
     settings["log_results"] = new_value
     save_settings(settings)
+    set_file_logging(new_value)
     
     status = "enabled" if new_value else "disabled"
     console.print(f"[green]Result logging {status}[/green]")
 
+# Log written by dbaudit.py, shown under View Previous Audit Results
+RESULTS_LOG_PATH = pathlib.Path("data", "logs", "dbaudit_results.log")
+
 def view_previous_results():
-    ensure_directories_exist()
     """View previous audit results"""
-    display_header()
-    console.print("[bold]View Previous Audit Results[/bold]")
-    console.print()
-    
-    # Check for log file
-    log_file = pathlib.Path("data/logs/dbaudit_results.log")
-    if not log_file.exists():
-        console.print("[yellow]No previous audit results found[/yellow]")
-        Prompt.ask("Press Enter to return to the main menu")
-        return
-    
-    # Check for result files
-    result_files = list(pathlib.Path.cwd().glob("audit_*.txt")) + list(pathlib.Path.cwd().glob("audit_*.json"))
-    
-    if not result_files:
-        console.print("[yellow]No audit result files found[/yellow]")
-        console.print("You can still view the log file.")
-    else:
-        console.print("[bold]Available Result Files:[/bold]")
-        for i, file in enumerate(result_files, 1):
-            console.print(f"{i}. {file.name}")
-    
-    console.print()
-    console.print("[bold]Options:[/bold]")
-    console.print("1. View Log File")
-    if result_files:
-        console.print("2. View Result File")
-    console.print(f"{'3' if result_files else '2'}. Return to Main Menu")
-    console.print()
-    
-    max_choice = 3 if result_files else 2
-    choice = Prompt.ask("Select an option", choices=[str(i) for i in range(1, max_choice + 1)], default="1")
-    
-    if choice == "1":
-        view_log_file(log_file)
-    elif choice == "2" and result_files:
-        view_result_file(result_files)
-    
-    if choice != str(max_choice):
+    while True:
+        display_header()
+        console.print("[bold]View Previous Audit Results[/bold]")
+        console.print()
+        
+        # Check for log file
+        log_file = RESULTS_LOG_PATH
+        if not log_file.exists():
+            console.print("[yellow]No previous audit results found[/yellow]")
+            Prompt.ask("Press Enter to return to the main menu")
+            return
+        
+        # Check for result files
+        result_files = list_result_files()
+        
+        if not result_files:
+            lines = ["[yellow]No audit result files found[/yellow]", "You can still view the log file."]
+        else:
+            lines = ["[bold]Available Result Files:[/bold]"]
+            lines.extend(f"{i}. {file.name}" for i, (file, _) in enumerate(result_files, 1))
+        
+        lines += ["", "[bold]Options:[/bold]", "1. View Log File"]
+        if result_files:
+            lines.append("2. View Result File")
+        lines.append(f"{'3' if result_files else '2'}. Return to Main Menu")
+        lines.append("")
+        console.print("\n".join(lines))
+        
+        max_choice = 3 if result_files else 2
+        choice = Prompt.ask("Select an option", choices=list(_choices(max_choice)), default="1")
+        
+        if choice == str(max_choice):
+            # Return to main menu
+            return
+        elif choice == "1":
+            view_log_file(log_file)
+        else:
+            view_result_file(result_files)
+        
         Prompt.ask("Press Enter to return to the results menu")
-        view_previous_results()
+
+def list_result_files(directory=_CWD):
+    """
+    Return (path, mtime) pairs for the audit_*.txt and audit_*.json files in
+    directory, reading each file's stat from a single directory scan. A
+    missing directory has no result files.
+    """
+    result_files = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith("audit_") and name.endswith((".txt", ".json")) and entry.is_file():
+                    result_files.append((pathlib.Path(entry.path), entry.stat().st_mtime))
+    except FileNotFoundError:
+        return result_files
+    result_files.sort()
+    return result_files
+
+def tail_lines(path, n=20, block=8192):
+    """Return the last n lines of a file, reading backwards from the end in blocks"""
+    if n <= 0:
+        return []
+    
+    # Reads are already block sized, so an extra buffer layer would only copy
+    with open(path, 'rb', buffering=0) as f:
+        pos = f.seek(0, os.SEEK_END)
+        blocks = []
+        newlines = 0
+        # One extra newline is needed to know the first kept line is complete
+        while pos > 0 and newlines <= n:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            blocks.append(chunk)
+            newlines += chunk.count(b"\n")
+    
+    # Blocks were collected end-first; join once instead of prepending each
+    data = b"".join(reversed(blocks))
+    # Only the lines being returned are decoded
+    return [line.decode('utf-8', errors='replace') for line in data.splitlines()[-n:]]
 
 def view_log_file(log_file):
     """View the log file"""
@@ -866,17 +1244,16 @@ def view_log_file(log_file):
     console.print()
     
     try:
-        with open(log_file, 'r') as f:
-            lines = f.readlines()
-        
         # Display the last 20 lines by default
-        num_lines = min(20, len(lines))
+        lines = tail_lines(log_file, 20)
+        num_lines = len(lines)
         
         console.print(f"[italic]Showing last {num_lines} lines of log file[/italic]")
         console.print()
         
-        for line in lines[-num_lines:]:
-            console.print(line.strip())
+        # Log lines are plain text, so skip markup parsing and highlighting
+        for line in lines:
+            console.out(line.rstrip(), highlight=False)
     except Exception as e:
         console.print(f"[red]Error reading log file: {e}[/red]")
 
@@ -885,71 +1262,53 @@ def view_result_file(result_files):
     console.print()
     console.print("[bold]Select Result File:[/bold]")
     
-    for i, file in enumerate(result_files):
-        file_name = os.path.basename(file)
-        file_time = dt.fromtimestamp(os.path.getmtime(file)).strftime("%Y-%m-%d %H:%M:%S")
-        console.print(f"{i+1}. {file_name} (Created: {file_time})")
+    for i, (file, mtime) in enumerate(result_files):
+        file_time = dt.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
+        console.print(f"{i+1}. {file.name} (Created: {file_time})")
     console.print(f"{len(result_files) + 1}. Cancel")
     console.print()
     
     choice = Prompt.ask(
         "Select a file to view", 
-        choices=[str(i) for i in range(1, len(result_files) + 2)],
+        choices=list(_choices(len(result_files) + 1)),
         default="1"
     )
     
     if int(choice) == len(result_files) + 1:
         return
     
-    selected_file = result_files[int(choice) - 1]
+    selected_file = result_files[int(choice) - 1][0]
     
     console.print()
     console.print(f"[bold]Contents of {selected_file.name}:[/bold]")
     console.print()
     
     try:
+        # Stream the file as plain text; audit results are not Rich markup
         with open(selected_file, 'r') as f:
-            content = f.read()
-        
-        console.print(content)
+            for chunk in iter(lambda: f.read(65536), ''):
+                console.out(chunk, end="", highlight=False)
+        console.out("")
     except Exception as e:
         console.print(f"[red]Error reading file: {e}[/red]")
 
 def backup_and_restore_menu():
-    ensure_directories_exist()
     """Menu for backup and restore"""
-    display_header()
-    console.print("[bold]Backup and Restore Databases[/bold]")
-    console.print()
-    
-    console.print("[bold]Options:[/bold]")
-    console.print("1. Backup Database")
-    console.print("2. Restore Database to Same Service")
-    console.print("3. Restore Database to New Service")
-    console.print("4. List Available Backups")
-    console.print("5. Delete Backup")
-    console.print("6. Create New Service")
-    console.print("7. Return to Main Menu")
-    console.print()
-    
-    choice = Prompt.ask("Select an option", choices=["1", "2", "3", "4", "5", "6", "7"], default="1")
-    
-    if choice == "1":
-        backup_database()
-    elif choice == "2":
-        restore_database(same_service=True)
-    elif choice == "3":
-        restore_database(same_service=False)
-    elif choice == "4":
-        list_backups()
-    elif choice == "5":
-        delete_backup()
-    elif choice == "6":
-        create_new_service()
-    
-    if choice != "7":
+    while True:
+        display_header()
+        console.print("[bold]Backup and Restore Databases[/bold]")
+        console.print()
+        
+        console.print(BACKUP_MENU_TEXT)
+        
+        choice = Prompt.ask("Select an option", choices=SEVEN_OPTION_CHOICES, default="1")
+        
+        if choice == "7":
+            # Return to main menu
+            return
+        BACKUP_MENU_ACTIONS[choice]()
+        
         Prompt.ask("Press Enter to return to the backup and restore menu")
-        backup_and_restore_menu()
 
 def create_new_service():
     """Create a new PostgreSQL service configuration"""
@@ -971,7 +1330,7 @@ def create_new_service():
     
     # Create service config
     try:
-        pg_service_parser = PgServiceConfigParser()
+        pg_service_parser = get_parser()
         pg_service_parser.add_service(
             service_name,
             host=host,
@@ -1016,7 +1375,7 @@ def backup_database():
     console.print("[bold]Backup Database:[/bold]")
     
     # Get available services
-    pg_service_parser = PgServiceConfigParser()
+    pg_service_parser = get_parser()
     pg_services = pg_service_parser.get_services()
     
     if not pg_services:
@@ -1038,7 +1397,7 @@ def backup_database():
     # Get service selection
     choice = Prompt.ask(
         "Select a service", 
-        choices=[str(i) for i in range(1, len(pg_services) + 2)],
+        choices=list(_choices(len(pg_services) + 1)),
         default="1"
     )
     
@@ -1048,20 +1407,10 @@ def backup_database():
     selected_service = pg_services[int(choice) - 1]
     
     # Get backup type
-    console.print()
-    console.print("[bold]Backup Type:[/bold]")
-    console.print("1. Full Backup (schema, data, and permissions)")
-    console.print("2. Schema Only (structure without data)")
-    console.print("3. Permissions Only (roles and grants)")
-    console.print()
+    console.print(BACKUP_TYPE_MENU_TEXT)
     
-    backup_choice = Prompt.ask("Select backup type", choices=["1", "2", "3"], default="1")
-    backup_types = {
-        "1": "full",
-        "2": "schema",
-        "3": "permissions"
-    }
-    backup_type = backup_types[backup_choice]
+    backup_choice = Prompt.ask("Select backup type", choices=BACKUP_TYPE_PROMPT_CHOICES, default="1")
+    backup_type = BACKUP_TYPE_CHOICES[backup_choice]
     
     # Get custom name (optional)
     console.print()
@@ -1071,18 +1420,22 @@ def backup_database():
         custom_name = Prompt.ask("Enter custom name")
     
     # Confirm
-    console.print()
-    console.print("[bold]Backup Configuration:[/bold]")
-    console.print(f"Service: [cyan]{selected_service.name}[/cyan]")
-    console.print(f"Database: [cyan]{selected_service.dbname}[/cyan]")
-    console.print(f"Backup Type: [cyan]{backup_type}[/cyan]")
+    lines = [
+        "",
+        "[bold]Backup Configuration:[/bold]",
+        f"Service: [cyan]{selected_service.name}[/cyan]",
+        f"Database: [cyan]{selected_service.dbname}[/cyan]",
+        f"Backup Type: [cyan]{backup_type}[/cyan]"
+    ]
     if custom_name:
-        console.print(f"Custom Name: [cyan]{custom_name}[/cyan]")
-    console.print()
+        lines.append(f"Custom Name: [cyan]{custom_name}[/cyan]")
+    lines.append("")
+    console.print("\n".join(lines))
     
     if Confirm.ask("Proceed with backup?", default=True):
         try:
             # Initialize backup manager with selected service
+            from utils.backup import BackupManager
             backup_manager = BackupManager(selected_service, console=console)
             
             # Create backup
@@ -1090,12 +1443,15 @@ def backup_database():
                 backup_type=backup_type,
                 custom_name=custom_name
             )
+            invalidate_backups()
             
             if backup_info:
-                console.print("[green]Backup completed successfully![/green]")
-                console.print(f"Backup ID: [cyan]{backup_info.id}[/cyan]")
-                console.print(f"Backup File: [cyan]{backup_info.file_path}[/cyan]")
-                console.print(f"Size: [cyan]{backup_info.size_bytes / 1024 / 1024:.2f} MB[/cyan]")
+                console.print(
+                    "[green]Backup completed successfully![/green]\n"
+                    f"Backup ID: [cyan]{backup_info.id}[/cyan]\n"
+                    f"Backup File: [cyan]{backup_info.file_path}[/cyan]\n"
+                    f"Size: [cyan]{backup_info.size_bytes * BYTES_TO_MB:.2f} MB[/cyan]"
+                )
                 
                 logger.info(f"Created {backup_type} backup of {selected_service.name} with ID {backup_info.id}")
             else:
@@ -1108,13 +1464,86 @@ def backup_database():
     console.print()
     Prompt.ask("Press Enter to return to the backup and restore menu")
 
+# Backup history written by BackupManager with its default backup directory
+BACKUP_HISTORY_PATH = os.path.join("backups", "backup_history.json")
+
+# (mtime_ns, backups, backups by service name) for the last backup history listing
+_BACKUPS_CACHE = None
+
+def get_backups_cached(service, service_name=None):
+    """
+    Return the recorded backups, or only those of service_name, reloading
+    the history only when its file changes
+    """
+    global _BACKUPS_CACHE
+    try:
+        mtime = os.stat(BACKUP_HISTORY_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+    
+    if _BACKUPS_CACHE is None or mtime is None or _BACKUPS_CACHE[0] != mtime:
+        from utils.backup import BackupManager
+        backups = BackupManager(service, console=console).list_backups()
+        by_service = {}
+        for backup in backups:
+            by_service.setdefault(backup.service, []).append(backup)
+        _BACKUPS_CACHE = (mtime, backups, by_service)
+    
+    if service_name is None:
+        return list(_BACKUPS_CACHE[1])
+    return list(_BACKUPS_CACHE[2].get(service_name, ()))
+
+def invalidate_backups():
+    """Forget the cached backup listing after a backup is created or deleted"""
+    global _BACKUPS_CACHE
+    _BACKUPS_CACHE = None
+
+# Multiplier turning a byte count into MB for display
+BYTES_TO_MB = 1.0 / (1024 * 1024)
+
+# (header, style) for the backup table columns; styles are parsed once here.
+# Column objects hold their cells, so fresh ones are made for every table.
+_INDEX_COLUMN = ("#", Style.parse("cyan"))
+_BACKUP_COLUMNS = tuple(
+    (header, Style.parse(style)) for header, style in (
+        ("ID", "cyan"),
+        ("Timestamp", "green"),
+        ("Service", "blue"),
+        ("Database", "magenta"),
+        ("Type", "yellow")
+    )
+)
+_SIZE_COLUMN = ("Size", Style.parse("cyan"))
+
+def build_backup_table(backups, include_index=False, include_size=False):
+    """Return a table of backups, optionally numbered and with their sizes"""
+    columns = list(_BACKUP_COLUMNS)
+    if include_index:
+        columns.insert(0, _INDEX_COLUMN)
+    if include_size:
+        columns.append(_SIZE_COLUMN)
+    backup_table = Table(*(Column(header, style=style) for header, style in columns), show_header=True)
+    
+    if include_size:
+        sizes = [f"{backup.size_bytes * BYTES_TO_MB:.2f} MB" for backup in backups]
+    
+    add_row = backup_table.add_row
+    for i, backup in enumerate(backups):
+        row = [backup.id, backup.timestamp, backup.service, backup.database, backup.backup_type]
+        if include_index:
+            row.insert(0, str(i + 1))
+        if include_size:
+            row.append(sizes[i])
+        add_row(*row)
+    return backup_table
+
 def list_backups():
     """List available backups"""
     console.print()
     console.print("[bold]Available Backups:[/bold]")
     
     # Get available services
-    pg_service_parser = PgServiceConfigParser()
+    pg_service_parser = get_parser()
     pg_services = pg_service_parser.get_services()
     
     if not pg_services:
@@ -1124,63 +1553,39 @@ def list_backups():
         return
     
     # Select a service to view backups for
-    console.print("[bold]Select a service to view backups for:[/bold]")
-    for i, service in enumerate(pg_services, 1):
-        console.print(f"{i}. {service.name} ({service.dbname})")
-    console.print(f"{len(pg_services) + 1}. All services")
-    console.print(f"{len(pg_services) + 2}. Cancel")
-    console.print()
+    lines = ["[bold]Select a service to view backups for:[/bold]"]
+    lines.extend(f"{i}. {service.name} ({service.dbname})" for i, service in enumerate(pg_services, 1))
+    lines.append(f"{len(pg_services) + 1}. All services")
+    lines.append(f"{len(pg_services) + 2}. Cancel")
+    lines.append("")
+    console.print("\n".join(lines))
     
     choice = Prompt.ask(
         "Select a service", 
-        choices=[str(i) for i in range(1, len(pg_services) + 3)],
+        choices=list(_choices(len(pg_services) + 2)),
         default="1"
     )
     
     if int(choice) == len(pg_services) + 2:
         return
     
-    # Initialize backup manager with the first service (just to access backup history)
-    backup_manager = BackupManager(pg_services[0], console=console)
-    backups = backup_manager.list_backups()
-    
-    if not backups:
-        console.print("[yellow]No backups found[/yellow]")
-        console.print()
-        Prompt.ask("Press Enter to return to the backup and restore menu")
-        return
+    # "All services" needs no filtering; otherwise fetch just that service's backups
+    selected_name = pg_services[int(choice) - 1].name if int(choice) <= len(pg_services) else None
     
-    # Filter backups by service if needed
-    if int(choice) <= len(pg_services):
-        selected_service = pg_services[int(choice) - 1]
-        backups = [b for b in backups if b.service == selected_service.name]
+    # The backup history is shared, so any service will do for listing it
+    backups = get_backups_cached(pg_services[0], selected_name)
     
     # Display backups
     if not backups:
-        console.print("[yellow]No backups found for the selected service[/yellow]")
+        if selected_name is None:
+            console.print("[yellow]No backups found[/yellow]")
+        else:
+            console.print("[yellow]No backups found for the selected service[/yellow]")
         console.print()
         Prompt.ask("Press Enter to return to the backup and restore menu")
         return
     
-    backup_table = Table(show_header=True)
-    backup_table.add_column("ID", style="cyan")
-    backup_table.add_column("Timestamp", style="green")
-    backup_table.add_column("Service", style="blue")
-    backup_table.add_column("Database", style="magenta")
-    backup_table.add_column("Type", style="yellow")
-    backup_table.add_column("Size", style="cyan")
-    
-    for backup in backups:
-        backup_table.add_row(
-            backup.id,
-            backup.timestamp,
-            backup.service,
-            backup.database,
-            backup.backup_type,
-            f"{backup.size_bytes / 1024 / 1024:.2f} MB"
-        )
-    
-    console.print(backup_table)
+    console.print(build_backup_table(backups, include_size=True))
     
     # Wait for user to acknowledge before returning to the backup and restore menu
     console.print()
@@ -1192,47 +1597,28 @@ def delete_backup():
     console.print("[bold]Delete Backup:[/bold]")
     
     # Get available services
-    pg_service_parser = PgServiceConfigParser()
+    pg_service_parser = get_parser()
     pg_services = pg_service_parser.get_services()
     
     if not pg_services:
         console.print("[yellow]No services found in pg_service.conf[/yellow]")
         return
     
-    # Initialize backup manager with the first service (just to access backup history)
-    backup_manager = BackupManager(pg_services[0], console=console)
-    backups = backup_manager.list_backups()
+    # The backup history is shared, so any service will do for listing it
+    backups = get_backups_cached(pg_services[0])
     
     if not backups:
         console.print("[yellow]No backups found[/yellow]")
         return
     
     # Display backups
-    backup_table = Table(show_header=True)
-    backup_table.add_column("#", style="cyan")
-    backup_table.add_column("ID", style="cyan")
-    backup_table.add_column("Timestamp", style="green")
-    backup_table.add_column("Service", style="blue")
-    backup_table.add_column("Database", style="magenta")
-    backup_table.add_column("Type", style="yellow")
-    
-    for i, backup in enumerate(backups, 1):
-        backup_table.add_row(
-            str(i),
-            backup.id,
-            backup.timestamp,
-            backup.service,
-            backup.database,
-            backup.backup_type
-        )
-    
-    console.print(backup_table)
+    console.print(build_backup_table(backups, include_index=True))
     console.print()
     
     # Get backup selection
     choice = Prompt.ask(
         "Select a backup to delete", 
-        choices=[str(i) for i in range(1, len(backups) + 1)] + ["c"],
+        choices=[*_choices(len(backups)), "c"],
         default="1"
     )
     
@@ -1242,20 +1628,22 @@ def delete_backup():
     selected_backup = backups[int(choice) - 1]
     
     # Confirm
-    console.print()
-    console.print("[bold]Delete Confirmation:[/bold]")
-    console.print(f"Backup ID: [cyan]{selected_backup.id}[/cyan]")
-    console.print(f"Timestamp: [cyan]{selected_backup.timestamp}[/cyan]")
-    console.print(f"Service: [cyan]{selected_backup.service}[/cyan]")
-    console.print(f"Database: [cyan]{selected_backup.database}[/cyan]")
-    console.print(f"Type: [cyan]{selected_backup.backup_type}[/cyan]")
-    console.print()
+    console.print(
+        "\n[bold]Delete Confirmation:[/bold]\n"
+        f"Backup ID: [cyan]{selected_backup.id}[/cyan]\n"
+        f"Timestamp: [cyan]{selected_backup.timestamp}[/cyan]\n"
+        f"Service: [cyan]{selected_backup.service}[/cyan]\n"
+        f"Database: [cyan]{selected_backup.database}[/cyan]\n"
+        f"Type: [cyan]{selected_backup.backup_type}[/cyan]\n"
+    )
     
     if Confirm.ask("Are you sure you want to delete this backup?", default=False):
         try:
-            # Delete backup using the current backup_manager
             # We don't need to find the original service, as the backup files are stored locally
+            from utils.backup import BackupManager
+            backup_manager = BackupManager(pg_services[0], console=console)
             success = backup_manager.delete_backup(backup_id=selected_backup.id)
+            invalidate_backups()
             
             if success:
                 console.print("[green]Backup deleted successfully![/green]")
@@ -1270,13 +1658,41 @@ def delete_backup():
     console.print()
     Prompt.ask("Press Enter to return to the backup and restore menu")
 
+def ensure_database_exists(service):
+    """
+    Create the service's database unless it already exists
+    
+    Connects to the 'postgres' database of the same server, checking and
+    creating over a single connection. Returns True if the database was created.
+    """
+    import psycopg
+    from psycopg import sql
+    
+    with psycopg.connect(
+        host=service.host,
+        port=service.port,
+        dbname="postgres",
+        user=service.user,
+        password=service.password or None,
+        autocommit=True
+    ) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (service.dbname,))
+            if cursor.fetchone():
+                return False
+            
+            console.print(f"[yellow]Database '{service.dbname}' does not exist. Creating...[/yellow]")
+            # CREATE DATABASE cannot take parameters, so quote the name as an identifier
+            cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(service.dbname)))
+            return True
+
 def restore_database(same_service=True):
     """Restore a database"""
     console.print()
     console.print("[bold]Restore Database:[/bold]")
     
     # Get available services
-    pg_service_parser = PgServiceConfigParser()
+    pg_service_parser = get_parser()
     pg_services = pg_service_parser.get_services()
     
     if not pg_services:
@@ -1285,40 +1701,21 @@ def restore_database(same_service=True):
             create_new_service()
         return
     
-    # Initialize backup manager with the first service (just to access backup history)
-    backup_manager = BackupManager(pg_services[0], console=console)
-    backups = backup_manager.list_backups()
+    # The backup history is shared, so any service will do for listing it
+    backups = get_backups_cached(pg_services[0])
     
     if not backups:
         console.print("[yellow]No backups found[/yellow]")
         return
     
     # Display backups
-    backup_table = Table(show_header=True)
-    backup_table.add_column("#", style="cyan")
-    backup_table.add_column("ID", style="cyan")
-    backup_table.add_column("Timestamp", style="green")
-    backup_table.add_column("Service", style="blue")
-    backup_table.add_column("Database", style="magenta")
-    backup_table.add_column("Type", style="yellow")
-    
-    for i, backup in enumerate(backups, 1):
-        backup_table.add_row(
-            str(i),
-            backup.id,
-            backup.timestamp,
-            backup.service,
-            backup.database,
-            backup.backup_type
-        )
-    
-    console.print(backup_table)
+    console.print(build_backup_table(backups, include_index=True))
     console.print()
     
     # Get backup selection
     choice = Prompt.ask(
         "Select a backup to restore", 
-        choices=[str(i) for i in range(1, len(backups) + 1)] + ["c"],
+        choices=[*_choices(len(backups)), "c"],
         default="1"
     )
     
@@ -1363,13 +1760,11 @@ def restore_database(same_service=True):
             )
         
         console.print(service_table)
-        console.print()
-        console.print(f"{len(pg_services) + 1}. Create New Service")
-        console.print()
+        console.print(f"\n{len(pg_services) + 1}. Create New Service\n")
         
         service_choice = Prompt.ask(
             "Select a service to restore to", 
-            choices=[str(i) for i in range(1, len(pg_services) + 2)],
+            choices=list(_choices(len(pg_services) + 1)),
             default="1"
         )
         
@@ -1391,16 +1786,19 @@ def restore_database(same_service=True):
         create_db = Confirm.ask(f"Create database '{target_service.dbname}' if it doesn't exist?", default=True)
     
     # Confirm
-    console.print()
-    console.print("[bold]Restore Configuration:[/bold]")
-    console.print(f"Backup ID: [cyan]{selected_backup.id}[/cyan]")
-    console.print(f"Backup Service: [cyan]{selected_backup.service}[/cyan]")
-    console.print(f"Backup Database: [cyan]{selected_backup.database}[/cyan]")
-    console.print(f"Target Service: [cyan]{target_service.name}[/cyan]")
-    console.print(f"Target Database: [cyan]{target_service.dbname}[/cyan]")
+    lines = [
+        "",
+        "[bold]Restore Configuration:[/bold]",
+        f"Backup ID: [cyan]{selected_backup.id}[/cyan]",
+        f"Backup Service: [cyan]{selected_backup.service}[/cyan]",
+        f"Backup Database: [cyan]{selected_backup.database}[/cyan]",
+        f"Target Service: [cyan]{target_service.name}[/cyan]",
+        f"Target Database: [cyan]{target_service.dbname}[/cyan]"
+    ]
     if create_db:
-        console.print(f"[cyan]Will create database if it doesn't exist[/cyan]")
-    console.print()
+        lines.append("[cyan]Will create database if it doesn't exist[/cyan]")
+    lines.append("")
+    console.print("\n".join(lines))
     
     if Confirm.ask("Proceed with restore?", default=False):
         try:
@@ -1408,49 +1806,11 @@ def restore_database(same_service=True):
             if create_db:
                 console.print(f"[bold]Checking if database '{target_service.dbname}' exists...[/bold]")
                 
-                # Connect to postgres database to check if target database exists
-                postgres_service = ServiceConfig(
-                    host=target_service.host,
-                    port=target_service.port,
-                    dbname="postgres",  # Connect to postgres database
-                    user=target_service.user,
-                    password=target_service.password
-                )
-                # Add name attribute for compatibility
-                postgres_service.name = target_service.name
-                
-                # Use psycopg to check if database exists and create it if needed
                 try:
-                    import psycopg
-                    
-                    # Create connection string
-                    conn_string = f"host={postgres_service.host} port={postgres_service.port} dbname=postgres user={postgres_service.user}"
-                    if postgres_service.password:
-                        conn_string += f" password={postgres_service.password}"
-                    
-                    # Connect to postgres database
-                    conn = psycopg.connect(conn_string)
-                    conn.autocommit = True
-                    cursor = conn.cursor()
-                    
-                    # Check if database exists
-                    cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (target_service.dbname,))
-                    exists = cursor.fetchone()
-                    
-                    if not exists:
-                        console.print(f"[yellow]Database '{target_service.dbname}' does not exist. Creating...[/yellow]")
-                        
-                        # Create database
-                        cursor.execute(f"CREATE DATABASE {target_service.dbname}")
-                        
+                    if ensure_database_exists(target_service):
                         console.print(f"[green]Database '{target_service.dbname}' created successfully![/green]")
                     else:
                         console.print(f"[green]Database '{target_service.dbname}' already exists.[/green]")
-                    
-                    # Close connection
-                    cursor.close()
-                    conn.close()
-                    
                 except Exception as e:
                     console.print(f"[red]Error checking/creating database: {e}[/red]")
                     logger.error(f"Error checking/creating database: {e}")
@@ -1460,6 +1820,7 @@ def restore_database(same_service=True):
                         return
             
             # Initialize backup manager with target service
+            from utils.backup import BackupManager
             restore_manager = BackupManager(target_service, console=console)
             
             # Restore backup
@@ -1479,36 +1840,20 @@ def restore_database(same_service=True):
     Prompt.ask("Press Enter to return to the backup and restore menu")
 
 def generate_html_reports():
-    ensure_directories_exist()
     """Generate HTML reports from audit results using Jinja2"""
     display_header()
     console.print("[bold]Generate HTML Reports[/bold]")
     console.print()
     
     # Check for audit result files in the data/audit_results directory
-    result_files = []
     audit_results_dir = os.path.join("data", "audit_results")
-    
-    # Ensure the directories exist
-    if not os.path.exists(audit_results_dir):
-        os.makedirs(audit_results_dir, exist_ok=True)
-    
-    # Look for audit files in data/audit_results
-    for file in os.listdir(audit_results_dir):
-        if file.startswith("audit_") and (file.endswith(".txt") or file.endswith(".json")):
-            result_files.append(os.path.join(audit_results_dir, file))
+    result_files = list_result_files(audit_results_dir)
     
     # Also look for audit files in the root directory (for backward compatibility)
-    for file in os.listdir():
-        if file.startswith("audit_") and (file.endswith(".txt") or file.endswith(".json")):
-            result_files.append(file)
+    result_files += list_result_files()
     
     # Also look for audit files in the reports directory
-    reports_dir = os.path.join("reports")
-    if os.path.exists(reports_dir):
-        for file in os.listdir(reports_dir):
-            if file.startswith("audit_") and (file.endswith(".txt") or file.endswith(".json")):
-                result_files.append(os.path.join(reports_dir, file))
+    result_files += list_result_files("reports")
     
     if not result_files:
         console.print("[yellow]No audit result files found in the data/audit_results directory.[/yellow]")
@@ -1516,15 +1861,14 @@ def generate_html_reports():
         Prompt.ask("Press Enter to return to the main menu")
         return
     
-    # Sort files by modification time (newest first)
-    result_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
+    # Sort files by modification time (newest first), using the mtimes from the scan
+    result_files.sort(key=lambda item: item[1], reverse=True)
     
     # Display available audit files
     console.print("[bold]Available Audit Result Files:[/bold]")
-    for i, file in enumerate(result_files):
-        file_name = os.path.basename(file)
-        file_time = dt.fromtimestamp(os.path.getmtime(file)).strftime("%Y-%m-%d %H:%M:%S")
-        console.print(f"{i+1}. {file_name} (Created: {file_time})")
+    for i, (file, mtime) in enumerate(result_files):
+        file_time = dt.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
+        console.print(f"{i+1}. {file.name} (Created: {file_time})")
     console.print()
     choice = Prompt.ask("Select a file to generate an HTML report (or 'q' to quit)", default="1")
     
@@ -1538,7 +1882,7 @@ def generate_html_reports():
             Prompt.ask("Press Enter to return to the main menu")
             return
         
-        selected_file = result_files[file_index]
+        selected_file = str(result_files[file_index][0])
         
         # Check if it's a JSON file
         if selected_file.endswith(".json"):
@@ -1661,27 +2005,36 @@ def generate_html_reports():
     console.print()
     Prompt.ask("Press Enter to return to the main menu")
 
+# Menu choice -> action, for every option except the one that leaves the menu
+MAIN_MENU_ACTIONS = {
+    "1": run_audit_menu,
+    "2": manage_pg_service_menu,
+    "3": configure_audit_settings,
+    "4": view_previous_results,
+    "5": backup_and_restore_menu,
+    "6": generate_html_reports
+}
+
+BACKUP_MENU_ACTIONS = {
+    "1": backup_database,
+    "2": functools.partial(restore_database, same_service=True),
+    "3": functools.partial(restore_database, same_service=False),
+    "4": list_backups,
+    "5": delete_backup,
+    "6": create_new_service
+}
+
 def main():
     """Main function for the interactive menu"""
+    _bootstrap()
     while True:
         display_header()
         choice = display_main_menu()
         
-        if choice == "1":
-            run_audit_menu()
-        elif choice == "2":
-            manage_pg_service_menu()
-        elif choice == "3":
-            configure_audit_settings()
-        elif choice == "4":
-            view_previous_results()
-        elif choice == "5":
-            backup_and_restore_menu()
-        elif choice == "6":
-            generate_html_reports()
-        elif choice == "7":
+        if choice == "7":
             console.print("[bold blue]Thank you for using PostgreSQL Database Permissions Audit Tool![/bold blue]")
             sys.exit(0)
+        MAIN_MENU_ACTIONS[choice]()
 
 if __name__ == "__main__":
     main()
@@ -9,7 +9,7 @@ import re
 import pathlib
 import logging
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 logger = logging.getLogger("dbaudit")
 
@@ -161,9 +161,87 @@ class PgServiceConfigParser:
         """Return list of available service names"""
         return list(self.services.keys())
     
+    def iter_services(self) -> Iterator[str]:
+        """Yield available service names without building a list"""
+        return iter(self.services)
+    
     def get_service_config(self, service_name: str) -> ServiceConfig:
         """Return configuration for specified service"""
         if service_name not in self.services:
             raise KeyError(f"Service '{service_name}' not found in configuration")
         
         return self.services[service_name]
+
+def _build_pg_service_candidates(pg_service_env, appdata):
+    """Return the (source, path) pairs searched for pg_service.conf, in order"""
+    candidates = [
+        ("current directory", pathlib.Path("pg_service.conf")),
+        ("config directory", pathlib.Path("config") / "pg_service.conf")
+    ]
+    
+    if pg_service_env:
+        candidates.append(("PGSERVICEFILE env", pathlib.Path(pg_service_env)))
+    
+    # Platform specific checks
+    if os.name == 'nt':  # Windows
+        if appdata:
+            candidates.append(("APPDATA", pathlib.Path(appdata) / "postgresql" / "pg_service.conf"))
+    else:  # Unix-like systems
+        candidates.append(("system directory", pathlib.Path("/etc/postgresql-common/pg_service.conf")))
+    
+    # Fall back to home directory, standard dot-prefixed location first
+    home_dir = pathlib.Path.home()
+    candidates.append(("home directory", home_dir / ".pg_service.conf"))
+    candidates.append(("home directory", home_dir / "pg_service.conf"))
+    
+    return tuple(candidates)
+
+# Located pg_service.conf paths keyed on (cwd, PGSERVICEFILE, APPDATA). Only
+# files that were actually found are cached, so one created later is still
+# picked up by the next lookup.
+_pg_service_conf_cache = {}
+
+def clear_pg_service_conf_cache():
+    """Forget located pg_service.conf paths; call after creating or moving one"""
+    _pg_service_conf_cache.clear()
+
+def _locate_pg_service_conf(pg_service_env, appdata):
+    """Search the standard locations in order (see find_pg_service_conf)"""
+    candidates = _build_pg_service_candidates(pg_service_env, appdata)
+    for source, path in candidates:
+        if path.exists():
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Using pg_service.conf from %s: %s", source, path.resolve())
+            return path
+    
+    # If we get here, we couldn't find the file
+    # Return the default location in the current directory
+    logger.warning("pg_service.conf not found in any standard location, using current directory")
+    return candidates[0][1]  # Return the current directory location even if it doesn't exist
+
+# Function to find pg_service.conf in various locations
+def find_pg_service_conf():
+    """
+    Look for pg_service.conf in multiple locations in order:
+    1. Current directory (highest priority)
+    2. Config subdirectory
+    3. PGSERVICEFILE environment variable if set
+    4. APPDATA/postgresql directory on Windows
+       or /etc/postgresql-common/pg_service.conf on Unix
+    5. ~/.pg_service.conf
+    6. ~/pg_service.conf
+    
+    A file that was found is cached per working directory and
+    PGSERVICEFILE/APPDATA value while it still exists; call
+    clear_pg_service_conf_cache() after creating a file that should take
+    priority over it.
+    """
+    key = (os.getcwd(), os.environ.get('PGSERVICEFILE'), os.environ.get('APPDATA'))
+    path = _pg_service_conf_cache.get(key)
+    if path is not None and path.exists():
+        return path
+    
+    path = _locate_pg_service_conf(key[1], key[2])
+    if path.exists():
+        _pg_service_conf_cache[key] = path
+    return path
@@ -2,3 +2,6 @@
 Utility modules for database audit tool
 """
 
+# Shared by the dbaudit and list_services entry points
+__version__ = "1.0.0"
+
@@ -7,6 +7,7 @@ and identify security issues based on risk levels.
 """
 
 import os
+import sys
 import time
 import datetime
 import enum
@@ -68,10 +69,22 @@ PERMISSION_RISK_MAP = {
     "DEFAULT": PermissionRisk.SAFE
 }
 
+# Table name fragments that mark a table as holding sensitive data
+SENSITIVE_TABLE_PATTERNS = (
+    'user', 'account', 'auth', 'password', 'credential',
+    'secret', 'key', 'token', 'payment', 'credit', 'ssn',
+    'customer', 'employee', 'salary', 'address'
+)
+
 
 class PermissionIssue:
     """Represents a permission issue found during audit"""
     
+    # Audits can produce a very large number of issues, so avoid a
+    # per-instance __dict__
+    __slots__ = ("object_type", "object_name", "grantee", "permission",
+                 "risk_level", "recommendation", "details", "timestamp")
+    
     def __init__(self, 
                  object_type: str, 
                  object_name: str, 
@@ -80,10 +93,12 @@ class PermissionIssue:
                  risk_level: PermissionRisk,
                  recommendation: str,
                  details: Optional[Dict[str, Any]] = None):
-        self.object_type = object_type
+        # Types, grantees and privileges repeat across issues; intern them so
+        # every issue (and its dangerous_permissions entry) shares one string
+        self.object_type = sys.intern(object_type)
         self.object_name = object_name
-        self.grantee = grantee
-        self.permission = permission
+        self.grantee = sys.intern(grantee)
+        self.permission = sys.intern(permission)
         self.risk_level = risk_level
         self.recommendation = recommendation
         self.details = details or {}
@@ -221,13 +236,16 @@ class PermissionAuditor:
             
     def run_audit(self, 
                  risk_levels: List[PermissionRisk] = None, 
-                 object_types: List[str] = None) -> AuditResult:
+                 object_types: List[str] = None,
+                 show_progress: bool = True) -> AuditResult:
         """
         Run a comprehensive audit of database permissions
         
         Args:
             risk_levels: List of risk levels to include in results
             object_types: List of object types to audit
+            show_progress: Draw the progress bar (off when another live
+                display, such as a backup spinner, is already on screen)
             
         """
         if risk_levels is None or not risk_levels:
@@ -249,7 +267,7 @@ class PermissionAuditor:
         # Reset audit result
         self.audit_result = AuditResult(self.database_name)
         self.issues = []
-        with Progress() as progress:
+        with Progress(console=self.console, disable=not show_progress) as progress:
             total_steps = len(object_types) + 2  # +2 for preparation tasks
             task = progress.add_task("[cyan]Running permission audit...", total=total_steps)
             
@@ -379,6 +397,9 @@ class PermissionAuditor:
                     )
                     self.audit_result.add_issue(issue)
                 # This could be extended based on naming conventions or schema organization
+                # Only grants on sensitive-looking tables to non-superusers are
+                # of interest, so let the server filter them rather than
+                # shipping every grant in the database back to the client
                 cur.execute("""
                     SELECT table_schema, table_name, grantee, privilege_type
                     FROM information_schema.role_table_grants 
@@ -386,37 +407,28 @@ class PermissionAuditor:
                     AND grantee <> 'postgres'
                     AND grantee <> current_user
                     AND grantee <> table_schema
+                    AND grantee NOT IN (SELECT rolname FROM pg_roles WHERE rolsuper)
+                    AND table_name ~* %s
                     ORDER BY table_schema, table_name;
-                """)
+                """, ("|".join(SENSITIVE_TABLE_PATTERNS),))
                 
-                for schema, table, grantee, privilege in cur.fetchall():
-                    # Skip superusers as grantees - expected to have access
-                    if grantee in self.superusers:
-                        continue
-                        
-                    # Detect potentially sensitive tables by name pattern
-                    is_sensitive = any(pattern in table.lower() for pattern in 
-                                     ['user', 'account', 'auth', 'password', 'credential', 
-                                      'secret', 'key', 'token', 'payment', 'credit', 'ssn', 
-                                      'customer', 'employee', 'salary', 'address'])
+                for schema, table, grantee, privilege in cur:
+                    risk_level = PermissionRisk.HIGH if privilege in ('SELECT', 'INSERT', 'UPDATE', 'DELETE') else PermissionRisk.MEDIUM
                     
-                    if is_sensitive:
-                        risk_level = PermissionRisk.HIGH if privilege in ('SELECT', 'INSERT', 'UPDATE', 'DELETE') else PermissionRisk.MEDIUM
-                        
-                        issue = PermissionIssue(
-                            object_type="table",
-                            object_name=f"{schema}.{table}",
-                            grantee=grantee,
-                            permission=privilege,
-                            risk_level=risk_level,
-                            recommendation=f"Review {privilege} for {grantee} on sensitive table {schema}.{table}",
-                            details={
-                                "schema": schema,
-                                "table": table,
-                                "sensitive": True
-                            }
-                        )
-                        self.audit_result.add_issue(issue)
+                    issue = PermissionIssue(
+                        object_type="table",
+                        object_name=f"{schema}.{table}",
+                        grantee=grantee,
+                        permission=privilege,
+                        risk_level=risk_level,
+                        recommendation=f"Review {privilege} for {grantee} on sensitive table {schema}.{table}",
+                        details={
+                            "schema": schema,
+                            "table": table,
+                            "sensitive": True
+                        }
+                    )
+                    self.audit_result.add_issue(issue)
         except Exception as e:
             self.console.print(f"[yellow]Warning: Error during table permission audit: {e}[/yellow]")
     
@@ -17,12 +17,21 @@ import platform
 from typing import Dict, List, Optional, Union, Any, Tuple
 from dataclasses import dataclass, field
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard json module
+    orjson = None
+
 from pg_service import ServiceConfig
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 
 logger = logging.getLogger("dbaudit")
 
+# The backup and restore spinners only show elapsed time, so redraw them
+# less often than Rich's default of 10 times a second
+SPINNER_REFRESH_PER_SECOND = 4
+
 @dataclass
 class BackupInfo:
     """Information about a database backup"""
@@ -74,8 +83,11 @@ class BackupManager:
             return {}
         
         try:
-            with open(self.history_file, 'r') as f:
-                history_data = json.load(f)
+            if orjson is not None:
+                history_data = orjson.loads(self.history_file.read_bytes())
+            else:
+                with open(self.history_file, 'r') as f:
+                    history_data = json.load(f)
                 
             # Convert to BackupInfo objects
             history = {}
@@ -112,8 +124,11 @@ class BackupManager:
                     "metadata": info.metadata
                 }
             
-            with open(self.history_file, 'w') as f:
-                json.dump(history_data, f, indent=2)
+            if orjson is not None:
+                self.history_file.write_bytes(orjson.dumps(history_data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(self.history_file, 'w') as f:
+                    json.dump(history_data, f, indent=2)
         except Exception as e:
             logger.error(f"Error saving backup history: {e}")
     
@@ -159,9 +174,11 @@ class BackupManager:
         
         return pg_binaries
     
-    def list_backups(self) -> List[BackupInfo]:
-        """List all available backups"""
-        return list(self.backup_history.values())
+    def list_backups(self, service: Optional[str] = None) -> List[BackupInfo]:
+        """List all available backups, or only those taken of the given service"""
+        if service is None:
+            return list(self.backup_history.values())
+        return [info for info in self.backup_history.values() if info.service == service]
     
     def get_backup_info(self, backup_id: str) -> Optional[BackupInfo]:
         """Get information about a specific backup"""
@@ -246,7 +263,8 @@ class BackupManager:
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 TimeElapsedColumn(),
-                console=self.console
+                console=self.console,
+                refresh_per_second=SPINNER_REFRESH_PER_SECOND
             ) as progress:
                 task = progress.add_task(f"Backing up {database_name} ({backup_type})...", total=None)
                 
@@ -394,7 +412,8 @@ class BackupManager:
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 TimeElapsedColumn(),
-                console=self.console
+                console=self.console,
+                refresh_per_second=SPINNER_REFRESH_PER_SECOND
             ) as progress:
                 task = progress.add_task(f"Restoring {database_name} from backup...", total=None)
                 
@@ -2,13 +2,20 @@
 PostgreSQL connection utilities
 """
 
+import atexit
 import logging
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import psycopg
+from psycopg.pq import TransactionStatus
 from pg_service import ServiceConfig
 
 logger = logging.getLogger("dbaudit")
 
+# Shared connection managers keyed on (host, port, dbname, user) so that
+# commands running in the same process reuse one established connection.
+# A manager is only reused while its full ServiceConfig is unchanged.
+_connection_pool: Dict[Tuple[str, str, str, str], "PostgresConnection"] = {}
+
 class PostgresConnection:
     """Manages PostgreSQL database connections using service configurations"""
     
@@ -82,9 +89,62 @@ class PostgresConnection:
         """Context manager entry point"""
         return self.connect()
     
+    def reset(self):
+        """
+        Return the connection to a clean state before it is handed out again
+
+        Any transaction left open or aborted by the previous user is rolled
+        back and autocommit goes back to its default. A connection that can
+        no longer be reset is closed so the next connect() opens a new one.
+        """
+        self._autocommit = False
+        if self.closed:
+            return
+        try:
+            if self.connection.info.transaction_status != TransactionStatus.IDLE:
+                self.connection.rollback()
+            self.connection.autocommit = False
+        except psycopg.Error as e:
+            logger.debug(f"Discarding connection that could not be reset: {e}")
+            self.close()
+    
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit point"""
         # Don't close the connection here to allow for reuse
         # The connection will be closed when the object is garbage collected
         # or when close() is explicitly called
         pass
+
+
+def get_pooled_connection(service_config: ServiceConfig) -> PostgresConnection:
+    """
+    Check out the shared connection manager for a service configuration
+
+    A manager created for different settings (for example an edited
+    password or sslmode) is closed and replaced, and a reused connection
+    is reset so no transaction or autocommit state carries over.
+    """
+    key = (
+        service_config.host,
+        str(service_config.port),
+        service_config.dbname,
+        service_config.user
+    )
+    conn_manager = _connection_pool.get(key)
+    if conn_manager is not None and conn_manager.service_config != service_config:
+        conn_manager.close()
+        conn_manager = None
+    if conn_manager is None:
+        conn_manager = PostgresConnection(service_config)
+        _connection_pool[key] = conn_manager
+    else:
+        conn_manager.reset()
+    return conn_manager
+
+def close_all_connections():
+    """Close every pooled connection"""
+    for conn_manager in _connection_pool.values():
+        conn_manager.close()
+    _connection_pool.clear()
+
+atexit.register(close_all_connections)